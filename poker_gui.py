@@ -13,8 +13,10 @@ Enhanced version with automatic analysis updates on card placement.
 """
 from __future__ import annotations
 import tkinter as tk
-from tkinter import ttk, messagebox
 import weakref, logging, math, re
+from types import MappingProxyType
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Tuple, Optional, Set
 
 # ──────────────────────────────────────────────────────
@@ -23,9 +25,13 @@ from typing import List, Dict, Tuple, Optional, Set
 from poker_modules import (
     Suit, Rank, RANKS_MAP, Card, Position, StackType, PlayerAction,
     HandAnalysis, GameState, get_hand_tier, analyse_hand, to_two_card_str,
-    get_position_advice, get_hand_advice, RANK_ORDER
+    get_position_advice, get_hand_advice, RANK_ORDER, clear_equity_cache, card_mask, CARD_INDEX,
+    CARD_BY_RANK_SUIT, CARD_BY_CODE, preflop_class
+)
+from poker_init import (
+    open_db, close_db, record_decision, update_decision, flush_decisions, decision_counts_today,
+    pending_decision_count
 )
-from poker_init import open_db, record_decision
 from poker_tablediagram import TableDiagramWindow
 
 # ──────────────────────────────────────────────────────
@@ -54,6 +60,44 @@ SUIT_COLORS = {
     "red": "#f43f5e",
     "black": "#38bdf8"
 }
+# Colour per suit, resolved once rather than via suit.color per widget:
+# the palette suits the dark suit headers, plain red/black the white card faces
+SUIT_COLOR_HEX = MappingProxyType({s: SUIT_COLORS[s.color] for s in Suit})
+CARD_FG = MappingProxyType({s: s.color for s in Suit})
+
+# Read-only lookups used on every refresh – built once, never per call
+# Recommendation -> colour, shared by the decision label and analysis text tags
+DECISION_COLORS = MappingProxyType({"RAISE": C_BTN_WARNING, "CALL": C_BTN_SUCCESS,
+                                    "FOLD": C_BTN_DANGER, "CHECK": C_BTN_INFO})
+STAGE_BY_BOARD_LEN = MappingProxyType({0: "Pre-flop", 3: "Flop", 4: "Turn", 5: "River"})
+# (label, value) for the position and stack radio buttons
+POSITION_CHOICES = tuple((p.name, p.name) for p in (Position.UTG, Position.MP1, Position.CO,
+                                                     Position.BTN, Position.SB, Position.BB))
+STACK_CHOICES = tuple((s.name.title(), s.value) for s in (StackType.SHORT, StackType.MEDIUM,
+                                                          StackType.DEEP))
+# Keys that start a typed card; the suit key completes it via CARD_BY_CODE
+RANK_KEYS = frozenset(RANK_ORDER)
+# Widgets whose keystrokes are text input, never card shortcuts
+TEXT_INPUT_WIDGETS = (tk.Entry, tk.Spinbox)
+# Radio-button value -> what the analysis needs, as plain dict lookups
+POSITION_BY_NAME = MappingProxyType({p.name: p for p in Position})
+STACK_BB_BY_VALUE = MappingProxyType({s.value: s.default_bb for s in StackType})
+
+
+# What a bet field may hold while being typed: digits, at most two decimals
+_AMOUNT_TEXT = re.compile(r"\d*(?:\.\d{0,2})?")
+
+
+def _is_amount_text(text: str) -> bool:
+    return _AMOUNT_TEXT.fullmatch(text) is not None
+
+
+def _to_cents(text: str) -> int:
+    """Parse a money field into whole cents; ValueError if blank, bad or negative."""
+    value = float(text)
+    if not math.isfinite(value) or value < 0:
+        raise ValueError(f"not a valid amount: {text!r}")
+    return round(value * 100)
 
 # ──────────────────────────────────────────────────────
 #  GUI Widgets
@@ -73,15 +117,32 @@ class StyledButton(tk.Button):
 
 class SelectableCard(tk.Label):
     """Card that can be clicked to select into next available slot."""
+    # Option sets are fixed, so build them once instead of on every state change
+    _USED_STYLE = {"bg": C_CARD_INACTIVE, "fg": C_TEXT_DIM, "cursor": "arrow"}
+    _HOVER_STYLE = {"bg": C_CARD_SELECTED, "relief": "raised"}
+    _IDLE_STYLE = {"bg": C_CARD, "relief": "solid"}
+    # Shared by all 52 grid cards; only text and colour differ per card
+    _BASE_OPTIONS = {"font": ("Arial", 12, "bold"), "bg": C_CARD, "width": 3, "height": 2,
+                     "bd": 2, "relief": "solid", "highlightthickness": 0, "cursor": "hand2"}
+
+    # Click and hover are bound once for the class (see bind_class_handlers)
+    # and reach each card through this bindtag, not 52 x 3 widget bindings
+    BINDTAG = "SelectableCard"
+
     def __init__(self, master: tk.Widget, card: Card, app):
-        super().__init__(master, text=str(card), font=("Arial", 12, "bold"),
-                         fg=card.suit.color, bg=C_CARD, width=3, height=2,
-                         bd=2, relief="solid", highlightthickness=0, cursor="hand2")
+        super().__init__(master, text=str(card), fg=CARD_FG[card.suit],
+                         **self._BASE_OPTIONS)
         self.card, self._app = card, weakref.proxy(app)
         self._is_used = False
-        self.bind("<Button-1>", self._on_click)
-        self.bind("<Enter>", self._on_enter)
-        self.bind("<Leave>", self._on_leave)
+        self._free_style = {"bg": C_CARD, "fg": CARD_FG[card.suit], "cursor": "hand2"}
+        self.bindtags((self.BINDTAG,) + self.bindtags())
+
+    @classmethod
+    def bind_class_handlers(cls, root: tk.Misc):
+        """Install the shared click/hover bindings; call once before building cards."""
+        root.bind_class(cls.BINDTAG, "<Button-1>", lambda e: e.widget._on_click(e))
+        root.bind_class(cls.BINDTAG, "<Enter>", lambda e: e.widget._on_enter(e))
+        root.bind_class(cls.BINDTAG, "<Leave>", lambda e: e.widget._on_leave(e))
 
     def _on_click(self, event):
         if self._is_used:
@@ -90,26 +151,31 @@ class SelectableCard(tk.Label):
 
     def _on_enter(self, event):
         if not self._is_used:
-            self.config(bg=C_CARD_SELECTED, relief="raised")
+            self.config(**self._HOVER_STYLE)
 
     def _on_leave(self, event):
         if not self._is_used:
-            self.config(bg=C_CARD, relief="solid")
+            self.config(**self._IDLE_STYLE)
 
     def set_used(self, used: bool):
         self._is_used = used
-        if used:
-            self.config(bg=C_CARD_INACTIVE, fg=C_TEXT_DIM, cursor="arrow")
-        else:
-            self.config(bg=C_CARD, fg=self.card.suit.color, cursor="hand2")
+        self.config(**(self._USED_STYLE if used else self._free_style))
 
 class CardSlot(tk.Frame):
+    # One inner label lives for the slot's lifetime; placing or clearing a
+    # card only reconfigures it instead of destroying and rebuilding widgets
+    _EMPTY_STYLE = {"font": ("Arial", 9), "fg": C_TEXT_DIM, "bg": "#0d3a26",
+                    "bd": 0, "relief": "flat", "cursor": ""}
+    _CARD_STYLE = {"font": ("Arial", 16, "bold"), "bg": C_CARD,
+                   "bd": 1, "relief": "solid", "cursor": "hand2"}
+
     def __init__(self, master: tk.Widget, name: str, app, slot_type: str = "board"):
         super().__init__(master, width=60, height=80, bg="#0d3a26", bd=2, relief="groove",
                          highlightbackground=C_BORDER, highlightthickness=1)
         self.pack_propagate(False)
-        self._label = tk.Label(self, text=name, bg="#0d3a26", fg=C_TEXT_DIM, font=("Arial", 9))
-        self._label.pack(expand=True)
+        self._label = tk.Label(self, text=name, **self._EMPTY_STYLE)
+        self._label.pack(expand=True, fill="both", padx=2, pady=2)
+        self._label.bind("<Button-1>", lambda *_: self.clear())
         self.card, self._app = None, weakref.proxy(app)
         self.slot_type = slot_type  # "hole" or "board"
 
@@ -118,17 +184,11 @@ class CardSlot(tk.Frame):
             return False  # Slot already occupied
         
         self.card = card
-        for w in self.winfo_children():
-            w.destroy()
-        
-        inner = tk.Label(self, text=str(card), font=("Arial", 16, "bold"),
-                         fg=card.suit.color, bg=C_CARD, bd=1, relief="solid", cursor="hand2")
-        inner.pack(expand=True, fill="both", padx=2, pady=2)
-        inner.bind("<Button-1>", lambda *_: self.clear())
+        self._app.slot_changed(self, None, card)
+        self._label.config(text=str(card), fg=CARD_FG[card.suit], **self._CARD_STYLE)
 
         self._app.grey_out(card)
 
-        # Immediate refresh
         self._app.force_refresh()
         return True
 
@@ -139,14 +199,9 @@ class CardSlot(tk.Frame):
         self._app.un_grey(self.card)
         old_card = self.card
         self.card = None
-        
-        for w in self.winfo_children():
-            w.destroy()
-        
-        self._label = tk.Label(self, text="Empty", bg="#0d3a26", fg=C_TEXT_DIM, font=("Arial", 9))
-        self._label.pack(expand=True)
+        self._app.slot_changed(self, old_card, None)
+        self._label.config(text="Empty", **self._EMPTY_STYLE)
 
-        # Immediate refresh
         self._app.force_refresh()
 
     def highlight(self, on: bool):
@@ -175,7 +230,10 @@ class PlayerToggle(tk.Frame):
         self.canvas = tk.Canvas(self, width=40, height=40, bg=C_PANEL, highlightthickness=0)
         self.canvas.pack(expand=True, pady=2)
         
-        # Draw player circle
+        # Circle and number are created once; _draw_player only recolours them
+        self._oval = self.canvas.create_oval(5, 5, 35, 35, outline="", width=0)
+        self._number = self.canvas.create_text(20, 20, text=str(self.player_num),
+                                               font=("Arial", 14, "bold"))
         self._draw_player()
         
         # Label
@@ -194,14 +252,10 @@ class PlayerToggle(tk.Frame):
             widget.bind("<Leave>", self._on_leave)
         
     def _draw_player(self):
-        self.canvas.delete("all")
         color = C_PLAYER_ACTIVE if self._is_active else C_PLAYER_INACTIVE
-        # Draw circle
-        self.canvas.create_oval(5, 5, 35, 35, fill=color, outline="", width=0)
-        # Draw player number
         text_color = "white" if self._is_active else C_TEXT_DIM
-        self.canvas.create_text(20, 20, text=str(self.player_num), 
-                               font=("Arial", 14, "bold"), fill=text_color)
+        self.canvas.itemconfig(self._oval, fill=color)
+        self.canvas.itemconfig(self._number, fill=text_color)
         
     def _toggle(self, event=None):
         self._is_active = not self._is_active
@@ -215,8 +269,7 @@ class PlayerToggle(tk.Frame):
         self.label.config(fg=C_TEXT if self._is_active else C_TEXT_DIM)
         
         # Update game state
-        self._app.update_active_players()
-        # Immediate refresh to show toggles/analysis updating instantly
+        self._app.player_toggled(self.player_num, self._is_active)
         self._app.force_refresh()
         
     def _on_enter(self, event):
@@ -242,15 +295,25 @@ class PokerAssistant(tk.Tk):
     FONT_SUBHEADER = ("Arial", 11, "bold")
     FONT_BODY = ("Consolas", 10)
     FONT_SMALL_LABEL = ("Arial", 9)
+    ANALYSIS_CACHE_SIZE = 64
+    # Queued decisions written without waiting for the flush timer
+    FLUSH_THRESHOLD = 32
     STYLE_ENTRY = {"bg": C_BTN_DARK, "fg": "white", "bd": 1, "relief": "solid",
                    "insertbackground": "white",
                    "font": ("Arial", 10),
                    "highlightthickness": 2,
                    "highlightcolor": C_BTN_PRIMARY,
                    "highlightbackground": C_BORDER}
+    # Shared options for the repeated field labels and radio buttons
+    STYLE_FIELD_LABEL = {"bg": C_BG, "fg": C_TEXT, "font": FONT_SMALL_LABEL}
+    STYLE_RADIO = {"bg": C_BG, "fg": C_TEXT, "selectcolor": C_BTN_DARK,
+                   "activebackground": C_BG, "activeforeground": C_TEXT}
 
     def __init__(self):
         super().__init__()
+        # Stay unmapped while the widget tree is built, so Tk lays it out
+        # once at the end instead of redrawing after every pack()
+        self.withdraw()
         self.title("Poker Assistant v16 - Pro Edition")
         self.geometry("1100x920")
         self.minsize(1000, 800)
@@ -260,28 +323,79 @@ class PokerAssistant(tk.Tk):
         # State vars
         self.position = tk.StringVar(value=Position.BTN.name)
         self.stack_type = tk.StringVar(value=StackType.MEDIUM.value)
-        self.small_blind = tk.DoubleVar(value=0.5)
-        self.big_blind = tk.DoubleVar(value=1.0)
+        # Resolved once per selection change instead of on every refresh
+        self._position = Position.BTN
+        self._stack_bb = StackType.MEDIUM.default_bb
+        # Money fields are kept as text and parsed to integer cents, so pot
+        # arithmetic never picks up float noise (0.1 + 0.2 != 0.3)
+        self.small_blind = tk.StringVar(value="0.50")
+        self.big_blind = tk.StringVar(value="1.00")
+        self._pot_cents = 0
+        self._call_cents = 0
+        # Money field texts the cents above were parsed from (None: not yet)
+        self._money_texts: Optional[tuple] = None
         self.num_players = tk.IntVar(value=6)
         
         # Seat positions
         self.hero_seat = tk.IntVar(value=1)
         self.dealer_seat = tk.IntVar(value=3)
+        # Traces rather than widget commands: they also catch values typed
+        # into the spinboxes, and every change lands in the one idle refresh
+        self.position.trace_add("write", self._on_position_change)
+        self.stack_type.trace_add("write", self._on_stack_change)
+        for seat in (self.hero_seat, self.dealer_seat):
+            seat.trace_add("write", self._on_seat_change)
 
         # Game state
         self.game_state = GameState()
 
         # UI state
-        self.grid_cards: Dict[str, SelectableCard] = {}
-        self.used_cards: set[str] = set()
+        # Grid widgets by CARD_INDEX, and the cards in play as a 52-bit mask
+        self.grid_cards_by_idx: List[Optional[SelectableCard]] = [None] * 52
+        self.used_mask = 0
+        # Cards currently in the hole/board slots, kept up to date by
+        # slot_changed() so refresh() never has to walk the slots
+        self._hole_cards: List[Card] = []
+        self._board_cards: List[Card] = []
+        self._board_str = ""
+        self._highlighted_slot: Optional[CardSlot] = None
         self.player_toggles: Dict[int, PlayerToggle] = {}
+        # Seats of the toggles that are on, kept in step by player_toggled()
+        self._active_seats: Set[int] = set()
         self._last_decision_id: Optional[int] = None
 
-        # Create table diagram window
-        self.table_window = TableDiagramWindow(self)
+        # Set once the window starts closing: worker callbacks then stop
+        # posting to Tk, and no new work is submitted
+        self._closing = False
+        # Single worker so DB writes stay ordered but never block the Tk loop
+        self._exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        # Open the shared DB connection (kept until _on_close, page cache warm)
+        # on the writer while the window builds; writes queue up behind it
+        self._submit_db_write(open_db)
+        # Equity simulation runs here so a slow spot never freezes the window;
+        # _analysis_gen tells late results from superseded refreshes apart
+        self._analysis_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analysis")
+        self._analysis_future = None
+        self._analysis_gen = 0
+        self._flush_job: Optional[str] = None
+        self._refresh_job: Optional[str] = None
+        self._stats_dirty = True
+        self._last_state_key: Optional[tuple] = None
+        # Recent analyse_hand results, least recently used first
+        self._analysis_cache: OrderedDict[tuple, HandAnalysis] = OrderedDict()
+        # Last (text, tag) parts drawn into each output Text widget
+        self._rendered: Dict[tk.Text, tuple] = {}
+
+        # The table diagram is a whole second window; it is only built the
+        # first time it is asked for, and hidden (not destroyed) when closed
+        self.table_window: Optional[TableDiagramWindow] = None
+        self._table_shown = False
+        self._table_equity: Optional[float] = None
         
         self._build_gui()
         self.update_active_players()
+        self.update_idletasks()
+        self.deiconify()
 
         # Keyboard shortcuts for quick card input
         self._key_entry_buffer = ""
@@ -292,12 +406,89 @@ class PokerAssistant(tk.Tk):
 
     def _on_close(self):
         """Handle main window close."""
-        if hasattr(self, 'table_window'):
+        if self._closing:
+            return
+        self._closing = True
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+        if self._flush_job is not None:
+            self.after_cancel(self._flush_job)
+        self._analysis_exec.shutdown(wait=False, cancel_futures=True)
+        # Let queued writes land before the process goes away. The Tk loop
+        # keeps running until they have: a worker thread that is marshalling
+        # a call onto it would otherwise deadlock against a blocking shutdown
+        closed = self._exec.submit(close_db)
+        self._exec.shutdown(wait=False)
+        self.withdraw()
+        self._finish_close(closed)
+
+    def _finish_close(self, closed):
+        if not closed.done():
+            self.after(20, self._finish_close, closed)
+            return
+        if closed.exception() is not None:
+            log.error(f"Closing the database failed: {closed.exception()}")
+        if self.table_window is not None:
             self.table_window.destroy()
         self.destroy()
 
+    def _submit_db_write(self, fn, *args, on_done=None):
+        """Run a DB write on the background worker, reporting back on the Tk thread."""
+        if self._closing:
+            return None  # close_db() flushes whatever is still queued
+        future = self._exec.submit(fn, *args)
+
+        def _done(f):
+            exc = f.exception()
+            if exc is not None:
+                if self._closing:
+                    log.error(f"Database write failed during shutdown: {exc}")
+                self._post_to_ui(self._on_db_error, exc)
+            elif on_done is not None:
+                self._post_to_ui(on_done, f.result())
+
+        future.add_done_callback(_done)
+        return future
+
+    def _on_db_error(self, exc: BaseException):
+        log.error(f"Database write failed: {exc}")
+        from tkinter import messagebox  # only needed on this rare path
+        messagebox.showerror("Error", f"Failed to save to database: {exc}")
+
+    def _on_decision_updated(self, _result=None):
+        """The recorded action landed – redraw the stats that count it."""
+        self._stats_dirty = True
+        self._update_stats_panel()
+
+    def _schedule_flush(self, delay_ms: int = 2000):
+        """Write queued decisions soon, batching everything recorded until then."""
+        if pending_decision_count() >= self.FLUSH_THRESHOLD:
+            self._flush_now()
+        elif self._flush_job is None:
+            self._flush_job = self.after(delay_ms, self._flush_now)
+
+    def _flush_now(self):
+        if self._flush_job is not None:
+            self.after_cancel(self._flush_job)
+        self._flush_job = None
+        self._submit_db_write(flush_decisions)
+
     def force_refresh(self):
-        """Force an immediate refresh of the entire UI."""
+        """Refresh the whole UI on the next idle turn, even if no input changed."""
+        self._last_state_key = None
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        """
+        Queue one refresh for when Tk goes idle. Every request made while
+        handling the current batch of events (clearing seven slots, a toggle
+        plus its player count) collapses into that single refresh.
+        """
+        if self._refresh_job is None:
+            self._refresh_job = self.after_idle(self._run_scheduled_refresh)
+
+    def _run_scheduled_refresh(self):
+        self._refresh_job = None
         self.refresh()
 
     def _build_gui(self):
@@ -328,13 +519,14 @@ class PokerAssistant(tk.Tk):
 
         card_container = tk.Frame(parent, bg=C_PANEL)
         card_container.pack(fill="x", expand=False, padx=10)
+        SelectableCard.bind_class_handlers(self)
 
         # --- Improved: Large suit highlighting ---
         for suit in [Suit.SPADE, Suit.HEART, Suit.DIAMOND, Suit.CLUB]:
             suit_frame = tk.Frame(card_container, bg=C_PANEL)
             suit_frame.pack(fill="x", pady=3)
             # Large icon
-            suit_color = SUIT_COLORS[suit.color]
+            suit_color = SUIT_COLOR_HEX[suit]
             symbol = suit.value
             icon_lbl = tk.Label(suit_frame, text=symbol, font=("Arial", 32, "bold"),
                                 fg=suit_color, bg=C_PANEL)
@@ -358,10 +550,10 @@ class PokerAssistant(tk.Tk):
             r1.pack()
             r2.pack(pady=(3, 0))
             for i, r_val in enumerate(RANK_ORDER):
-                card = Card(r_val, suit)
+                card = CARD_BY_RANK_SUIT[r_val, suit]
                 w = SelectableCard(r1 if i < 7 else r2, card, self)
                 w.pack(side="left", padx=2)
-                self.grid_cards[str(card)] = w
+                self.grid_cards_by_idx[CARD_INDEX[card]] = w
 
     def _build_table_area(self, parent):
         """Build the table configuration area."""
@@ -376,41 +568,28 @@ class PokerAssistant(tk.Tk):
         # Position selection
         pos_frame = tk.Frame(row1, bg=C_BG)
         pos_frame.pack(side="left", padx=(0, 30))
-        tk.Label(pos_frame, text="Position:", bg=C_BG, fg=C_TEXT,
-                font=self.FONT_SMALL_LABEL).pack(side="left", padx=(0, 5))
+        tk.Label(pos_frame, text="Position:", **self.STYLE_FIELD_LABEL).pack(side="left", padx=(0, 5))
         
-        # Fixed: Use MP1 instead of MP
-        positions = [("UTG", Position.UTG.name), ("MP1", Position.MP1.name),
-                    ("CO", Position.CO.name), ("BTN", Position.BTN.name),
-                    ("SB", Position.SB.name), ("BB", Position.BB.name)]
-        for text, val in positions:
+        for text, val in POSITION_CHOICES:
             rb = tk.Radiobutton(pos_frame, text=text, variable=self.position, value=val,
-                               bg=C_BG, fg=C_TEXT, selectcolor=C_BTN_DARK,
-                               activebackground=C_BG, activeforeground=C_TEXT,
-                               command=self.refresh)
+                               **self.STYLE_RADIO)
             rb.pack(side="left", padx=2)
 
         # Stack size
         stack_frame = tk.Frame(row1, bg=C_BG)
         stack_frame.pack(side="left")
-        tk.Label(stack_frame, text="Stack:", bg=C_BG, fg=C_TEXT,
-                font=self.FONT_SMALL_LABEL).pack(side="left", padx=(0, 5))
+        tk.Label(stack_frame, text="Stack:", **self.STYLE_FIELD_LABEL).pack(side="left", padx=(0, 5))
         
-        stacks = [("Short", StackType.SHORT.value), ("Medium", StackType.MEDIUM.value),
-                 ("Deep", StackType.DEEP.value)]
-        for text, val in stacks:
+        for text, val in STACK_CHOICES:
             rb = tk.Radiobutton(stack_frame, text=text, variable=self.stack_type, value=val,
-                               bg=C_BG, fg=C_TEXT, selectcolor=C_BTN_DARK,
-                               activebackground=C_BG, activeforeground=C_TEXT,
-                               command=self.refresh)
+                               **self.STYLE_RADIO)
             rb.pack(side="left", padx=2)
 
         # Second row: Players
         row2 = tk.Frame(tf, bg=C_BG)
         row2.pack(fill="x", padx=15, pady=(5, 10))
 
-        tk.Label(row2, text="Active Players:", bg=C_BG, fg=C_TEXT,
-                font=self.FONT_SMALL_LABEL).pack(side="left", padx=(0, 10))
+        tk.Label(row2, text="Active Players:", **self.STYLE_FIELD_LABEL).pack(side="left", padx=(0, 10))
 
         # Player toggles
         for i in range(1, 10):
@@ -425,19 +604,17 @@ class PokerAssistant(tk.Tk):
         # Hero seat
         hero_frame = tk.Frame(row3, bg=C_BG)
         hero_frame.pack(side="left", padx=(0, 30))
-        tk.Label(hero_frame, text="Hero Seat:", bg=C_BG, fg=C_TEXT,
-                font=self.FONT_SMALL_LABEL).pack(side="left", padx=(0, 5))
+        tk.Label(hero_frame, text="Hero Seat:", **self.STYLE_FIELD_LABEL).pack(side="left", padx=(0, 5))
         hero_spin = tk.Spinbox(hero_frame, from_=1, to=9, textvariable=self.hero_seat,
-                              width=5, command=self.refresh, **self.STYLE_ENTRY)
+                              width=5, **self.STYLE_ENTRY)
         hero_spin.pack(side="left")
 
         # Dealer seat
         dealer_frame = tk.Frame(row3, bg=C_BG)
         dealer_frame.pack(side="left")
-        tk.Label(dealer_frame, text="Dealer Seat:", bg=C_BG, fg=C_TEXT,
-                font=self.FONT_SMALL_LABEL).pack(side="left", padx=(0, 5))
+        tk.Label(dealer_frame, text="Dealer Seat:", **self.STYLE_FIELD_LABEL).pack(side="left", padx=(0, 5))
         dealer_spin = tk.Spinbox(dealer_frame, from_=1, to=9, textvariable=self.dealer_seat,
-                                width=5, command=self.refresh, **self.STYLE_ENTRY)
+                                width=5, **self.STYLE_ENTRY)
         dealer_spin.pack(side="left")
 
     def _build_control_panel(self, parent):
@@ -479,6 +656,8 @@ class PokerAssistant(tk.Tk):
         self.board = [CardSlot(board_slots, f"Card {i+1}", self, "board") for i in range(5)]
         for slot in self.board:
             slot.pack(side="left", padx=3)
+        # Every slot in entry order, built once for the scans below
+        self._slots = (*self.hole, *self.board)
 
         # Betting controls
         bet_frame = tk.Frame(cf, bg=C_BG)
@@ -490,15 +669,13 @@ class PokerAssistant(tk.Tk):
         
         sb_frame = tk.Frame(blinds_frame, bg=C_BG)
         sb_frame.pack(side="left", padx=(0, 15))
-        tk.Label(sb_frame, text="Small Blind:", bg=C_BG, fg=C_TEXT,
-                font=self.FONT_SMALL_LABEL).pack()
+        tk.Label(sb_frame, text="Small Blind:", **self.STYLE_FIELD_LABEL).pack()
         sb_entry = tk.Entry(sb_frame, textvariable=self.small_blind, width=8, **self.STYLE_ENTRY)
         sb_entry.pack()
 
         bb_frame = tk.Frame(blinds_frame, bg=C_BG)
         bb_frame.pack(side="left")
-        tk.Label(bb_frame, text="Big Blind:", bg=C_BG, fg=C_TEXT,
-                font=self.FONT_SMALL_LABEL).pack()
+        tk.Label(bb_frame, text="Big Blind:", **self.STYLE_FIELD_LABEL).pack()
         bb_entry = tk.Entry(bb_frame, textvariable=self.big_blind, width=8, **self.STYLE_ENTRY)
         bb_entry.pack()
 
@@ -508,18 +685,74 @@ class PokerAssistant(tk.Tk):
         
         pot_inner = tk.Frame(pot_frame, bg=C_BG)
         pot_inner.pack(side="left", padx=(0, 15))
-        tk.Label(pot_inner, text="Current Pot:", bg=C_BG, fg=C_TEXT,
-                font=self.FONT_SMALL_LABEL).pack()
+        tk.Label(pot_inner, text="Current Pot:", **self.STYLE_FIELD_LABEL).pack()
         self.pot_entry = tk.Entry(pot_inner, width=10, **self.STYLE_ENTRY)
         self.pot_entry.pack()
 
         call_inner = tk.Frame(pot_frame, bg=C_BG)
         call_inner.pack(side="left")
-        tk.Label(call_inner, text="To Call:", bg=C_BG, fg=C_TEXT,
-                font=self.FONT_SMALL_LABEL).pack()
+        tk.Label(call_inner, text="To Call:", **self.STYLE_FIELD_LABEL).pack()
         self.call_entry = tk.Entry(call_inner, width=10, **self.STYLE_ENTRY)
         self.call_entry.pack()
 
+        # Inline status line for input problems – never a modal dialog
+        self.status_label = tk.Label(bet_frame, text="", bg=C_BG, fg=C_BTN_WARNING,
+                                     font=self.FONT_SMALL_LABEL)
+        self.status_label.pack(side="left", padx=(15, 0))
+        self._status_job: Optional[str] = None
+
+        # Keystrokes that could never form an amount are refused outright (one
+        # compiled-regex match); the value is checked and re-analysed when the
+        # field is committed, not per keystroke
+        amount_vcmd = (self.register(_is_amount_text), "%P")
+        for entry, label, required in ((sb_entry, "Small blind", True),
+                                       (bb_entry, "Big blind", True),
+                                       (self.pot_entry, "Pot", False),
+                                       (self.call_entry, "To call", False)):
+            entry.config(validate="key", validatecommand=amount_vcmd)
+            validate = lambda e, en=entry, lb=label, rq=required: self._validate_amount(en, lb, rq)
+            entry.bind("<Return>", validate)
+            entry.bind("<FocusOut>", validate)
+
+    def _on_position_change(self, *_):
+        self._position = POSITION_BY_NAME[self.position.get()]
+        self._schedule_refresh()
+
+    def _on_stack_change(self, *_):
+        self._stack_bb = STACK_BB_BY_VALUE[self.stack_type.get()]
+        self._schedule_refresh()
+
+    def _on_seat_change(self, *_):
+        try:
+            self.hero_seat.get(), self.dealer_seat.get()
+        except tk.TclError:
+            return  # spinbox is mid-edit (empty or not a number yet)
+        self._schedule_refresh()
+
+    def _validate_amount(self, entry: tk.Entry, label: str, required: bool):
+        """Clamp a bet field to a non-negative number, then schedule a refresh."""
+        text = entry.get().strip()
+        if text or required:
+            try:
+                _to_cents(text)
+            except ValueError:
+                entry.delete(0, tk.END)
+                entry.insert(0, "0")
+                self._show_status(f"{label} must be a non-negative number – reset to 0")
+        # Unchanged values are dropped by refresh()'s state fingerprint
+        self._schedule_refresh()
+
+    def _show_status(self, message: str, fg: str = C_BTN_WARNING, timeout_ms: int = 4000):
+        """Show a transient message in the status line."""
+        self.status_label.config(text=message, fg=fg)
+        if self._status_job is not None:
+            self.after_cancel(self._status_job)
+        self._status_job = self.after(timeout_ms, self._clear_status)
+
+    def _clear_status(self):
+        self._status_job = None
+        self.status_label.config(text="")
+
     def _build_action_panel(self, parent):
         """Build the action panel with decision tracking."""
         af = tk.LabelFrame(parent, text=" 🎯 ACTIONS ", bg=C_BG, fg=C_TEXT,
@@ -558,6 +791,11 @@ class PokerAssistant(tk.Tk):
                                    command=self._reset_hand)
         new_hand_btn.pack(side="right", padx=(20, 0))
 
+        table_btn = StyledButton(btn_frame, text="🪑 Table",
+                                 color=C_BTN_DARK, hover_color=C_BTN_DARK_HOVER,
+                                 command=self._show_table_window)
+        table_btn.pack(side="right")
+
     def _build_analysis_area(self, parent):
         """Build the analysis display area."""
         self.analysis_frame = tk.LabelFrame(parent, text=" 📊 HAND ANALYSIS ", 
@@ -582,279 +820,405 @@ class PokerAssistant(tk.Tk):
                                  bd=0, padx=15, pady=10)
         self.stats_text.pack(fill="x", padx=2, pady=2)
 
+        # Tag specs are built once and applied to both widgets from the table
+        bold = (*self.FONT_BODY, "bold")
+        tag_specs = [("heading", {"font": bold})]
+        tag_specs += [(decision, {"foreground": color, "font": bold})
+                      for decision, color in DECISION_COLORS.items()]
+        for widget in (self.analysis_text, self.stats_text):
+            for name, opts in tag_specs:
+                widget.tag_configure(name, **opts)
+
     def _reset_cards_only(self):
         """Only clear all cards, don't touch pot/players."""
-        for slot in self.hole + self.board:
+        for slot in self._slots:
             slot.clear()
         self.force_refresh()
 
     def place_card_in_next_slot(self, card: Card):
         """Place a card in the next available slot."""
-        # Try hole cards first
-        for slot in self.hole:
-            if slot.set_card(card):
-                self._highlight_next_slot()
-                return
-        
-        # Then try board cards
-        for slot in self.board:
+        # used_mask is the membership check for every entry path: one bit test
+        if self.used_mask >> CARD_INDEX[card] & 1:
+            return
+        # Hole cards first, then the board
+        for slot in self._slots:
             if slot.set_card(card):
                 self._highlight_next_slot()
                 return
         
-        messagebox.showinfo("No Free Slots", "All card slots are full. Remove a card first.")
+        self._show_status("All card slots are full – remove a card first")
+
+    def slot_changed(self, slot: CardSlot, old: Optional[Card], new: Optional[Card]):
+        """Keep the hole/board card lists in step with a slot's contents."""
+        cards = self._hole_cards if slot.slot_type == "hole" else self._board_cards
+        if old is not None:
+            cards.remove(old)
+        if new is not None:
+            cards.append(new)
+        if cards is self._board_cards:
+            # Shared by the DB row and the analysis panel; only a board edit changes it
+            self._board_str = " ".join(map(str, cards))
 
     def _highlight_next_slot(self):
         """Highlight the next available slot for card entry."""
-        candidates = self.hole + self.board
-        found = False
-        for slot in candidates:
-            if not slot.card and not found:
-                slot.highlight(True)
-                found = True
-            else:
-                slot.highlight(False)
-        if not found:
-            for slot in candidates:
-                slot.highlight(False)
+        target = next((s for s in self._slots if not s.card), None)
+        # Only the slots whose state flips are touched, not all seven
+        if target is self._highlighted_slot:
+            return
+        if self._highlighted_slot is not None:
+            self._highlighted_slot.highlight(False)
+        if target is not None:
+            target.highlight(True)
+        self._highlighted_slot = target
 
     def _handle_keypress(self, event):
         """Handle keyboard shortcuts for rapid card entry."""
+        # Keys typed into a bet or seat field belong to that field, not to
+        # card entry ("a" in the pot box must not start an ace)
+        if isinstance(event.widget, TEXT_INPUT_WIDGETS):
+            return
         key = event.char.upper()
-        # Acceptable rank input
-        valid_ranks = {
-            'A': 'A', 'K': 'K', 'Q': 'Q', 'J': 'J', 'T': 'T',
-            '2': '2', '3': '3', '4': '4', '5': '5', '6': '6',
-            '7': '7', '8': '8', '9': '9'
-        }
-        valid_suits = {'S': Suit.SPADE, 'H': Suit.HEART, 'D': Suit.DIAMOND, 'C': Suit.CLUB}
-
-        if key in valid_ranks:
+        if key in RANK_KEYS:
             self._key_entry_buffer = key
-        elif key in valid_suits and self._key_entry_buffer:
-            card = Card(self._key_entry_buffer, valid_suits[key])
-            cardstr = str(card)
-            if cardstr in self.grid_cards and not self.grid_cards[cardstr]._is_used:
-                self.place_card_in_next_slot(card)
+        elif self._key_entry_buffer and (card := CARD_BY_CODE.get(self._key_entry_buffer + key)):
+            self.place_card_in_next_slot(card)
             self._key_entry_buffer = ""
         else:
             self._key_entry_buffer = ""
 
     def grey_out(self, card: Card):
         """Mark a card as used in the grid."""
-        card_str = str(card)
-        if card_str in self.grid_cards:
-            self.grid_cards[card_str].set_used(True)
-            self.used_cards.add(card_str)
+        idx = CARD_INDEX[card]
+        if self.used_mask >> idx & 1:
+            return
+        self.used_mask |= 1 << idx
+        self.grid_cards_by_idx[idx].set_used(True)
 
     def un_grey(self, card: Card):
         """Mark a card as available in the grid."""
-        card_str = str(card)
-        if card_str in self.grid_cards:
-            self.grid_cards[card_str].set_used(False)
-            self.used_cards.discard(card_str)
+        idx = CARD_INDEX[card]
+        if not self.used_mask >> idx & 1:
+            return
+        self.used_mask &= ~(1 << idx)
+        self.grid_cards_by_idx[idx].set_used(False)
 
     def update_active_players(self):
-        """Update the number of active players based on toggles."""
-        active_count = sum(1 for toggle in self.player_toggles.values() if toggle.is_active())
-        self.num_players.set(max(2, active_count))  # Minimum 2 players
+        """Resync the active seats from every toggle (startup only)."""
+        self._active_seats = {i for i, toggle in self.player_toggles.items() if toggle.is_active()}
+        self.num_players.set(max(2, len(self._active_seats)))  # Minimum 2 players
+
+    def player_toggled(self, seat: int, active: bool):
+        """One toggle flipped – adjust the active seats without rescanning."""
+        if active:
+            self._active_seats.add(seat)
+        else:
+            self._active_seats.discard(seat)
+        self.num_players.set(max(2, len(self._active_seats)))  # Minimum 2 players
         
     def _update_game_state(self):
         """Update game state from UI inputs."""
+        pot_text = self.pot_entry.get().strip()
+        call_text = self.call_entry.get().strip()
+        texts = (pot_text, call_text, self.small_blind.get(), self.big_blind.get())
+        # Card and toggle refreshes leave the money fields alone – keep the parse
+        if texts == self._money_texts:
+            return
+        self._money_texts = texts
+        gs = self.game_state
         try:
-            pot_text = self.pot_entry.get().strip()
-            call_text = self.call_entry.get().strip()
-            
             if pot_text and call_text:
-                self.game_state.is_active = True
-                self.game_state.pot = float(pot_text)
-                self.game_state.to_call = float(call_text)
+                gs.is_active = True
+                pot_cents, call_cents = _to_cents(pot_text), _to_cents(call_text)
             else:
-                self.game_state.is_active = False
-                self.game_state.pot = self.small_blind.get() + self.big_blind.get()
-                self.game_state.to_call = self.big_blind.get()
+                gs.is_active = False
+                call_cents = _to_cents(self.big_blind.get())
+                pot_cents = _to_cents(self.small_blind.get()) + call_cents
+            self._pot_cents, self._call_cents = pot_cents, call_cents
         except ValueError:
-            self.game_state.is_active = False
+            gs.is_active = False
+        # Analysis works in currency units; convert once from the exact cents
+        gs.pot = self._pot_cents / 100
+        gs.to_call = self._call_cents / 100
 
     def _record_action(self, action: PlayerAction):
         """Record a player action."""
         if self._last_decision_id is None:
-            messagebox.showwarning("No Analysis", 
-                                 "Add 2 hole cards first to get hand analysis before recording actions.")
+            self._show_status("Add 2 hole cards first to get hand analysis before recording actions")
             return
         
-        try:
-            record_decision(self._last_decision_id, action.value)
-            messagebox.showinfo("Action Recorded", 
-                              f"Your {action.value} action has been recorded.")
-        except Exception as e:
-            log.error(f"Failed to record action: {e}")
-            messagebox.showerror("Error", f"Failed to record action: {e}")
+        # Optimistic: confirm straight away, errors come back via _on_db_error
+        self._submit_db_write(update_decision, self._last_decision_id, action.name,
+                              on_done=self._on_decision_updated)
+        self._show_status(f"Your {action.name} action has been recorded", fg=C_BTN_SUCCESS)
 
     def _reset_hand(self):
         """Reset for a new hand."""
-        for slot in self.hole + self.board:
+        for slot in self._slots:
             slot.clear()
         self.pot_entry.delete(0, tk.END)
         self.call_entry.delete(0, tk.END)
         self.game_state = GameState()
+        self._pot_cents = self._call_cents = 0
+        self._money_texts = None
         self._last_decision_id = None
-        self.refresh()
+        clear_equity_cache()
+        self._analysis_cache.clear()
+        self.force_refresh()
+
+    def _state_key(self) -> Optional[tuple]:
+        """Fingerprint of every input refresh() reads; None if one is unreadable."""
+        try:
+            return (
+                tuple(self._hole_cards), tuple(self._board_cards),
+                self._position, self._stack_bb,
+                self.small_blind.get(), self.big_blind.get(),
+                self.pot_entry.get().strip(), self.call_entry.get().strip(),
+                self.num_players.get(), self.hero_seat.get(), self.dealer_seat.get(),
+                frozenset(self._active_seats),
+            )
+        except tk.TclError:
+            return None
 
     def refresh(self):
         """Main refresh method that updates everything."""
-        hole = [s.card for s in self.hole if s.card]
-        board = [s.card for s in self.board if s.card]
+        # A direct refresh supersedes any idle one still waiting
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+
+        # FocusOut and friends fire without anything changing – skip those
+        key = self._state_key()
+        if key is not None and key == self._last_state_key:
+            return
+        self._last_state_key = key
+
+        # Copies: the analysis worker holds on to them after this returns
+        hole, board = list(self._hole_cards), list(self._board_cards)
 
-        self._clear_output_panels()
         self._update_game_state()
 
         # Highlight next slot
         self._highlight_next_slot()
 
-        # Determine stage
-        stage_lookup = {0: "Pre-flop", 3: "Flop", 4: "Turn", 5: "River"}
-        stage = stage_lookup.get(len(board), "Post-flop")
+        # Anything still being analysed belongs to the previous inputs
+        self._analysis_gen += 1
+        if self._analysis_future is not None:
+            self._analysis_future.cancel()
+            self._analysis_future = None
 
-        analysis: Optional[HandAnalysis] = None
+        equity: Optional[float] = None
         
         # Show analysis if we have 2 hole cards
         if len(hole) == 2:
-            analysis = self._update_analysis_panel(hole, board)
-            
-            # Update decision label with current recommendation
-            colors = {"RAISE": C_BTN_WARNING, "CALL": C_BTN_SUCCESS, 
-                     "FOLD": C_BTN_DANGER, "CHECK": C_BTN_INFO}
-            self.decision_label.config(
-                text=f"→ {analysis.decision}",
-                fg=colors.get(analysis.decision, C_TEXT)
-            )
+            equity = self._start_analysis(hole, board)
         else:
             self._display_welcome_message()
             self.decision_label.config(text="→ Add 2 hole cards to begin...", fg=C_TEXT_DIM)
             self._last_decision_id = None
 
         self._update_stats_panel()
+        self._update_table_diagram(equity)
 
-        # Update table diagram
-        active_players = {i for i, toggle in self.player_toggles.items() if toggle.is_active()}
-        pot = self.game_state.pot if self.game_state.is_active else (self.small_blind.get() + self.big_blind.get())
-        to_call = self.game_state.to_call if self.game_state.is_active else self.big_blind.get()
-        equity = analysis.equity if analysis else None
-        
+    def _show_table_window(self):
+        """Open the table diagram, building it on first use."""
+        if self.table_window is None:
+            self.table_window = TableDiagramWindow(self)
+            self.table_window.protocol("WM_DELETE_WINDOW", self._hide_table_window)
+        else:
+            self.table_window.deiconify()
+            self.table_window.lift()
+        self._table_shown = True
+        self._update_table_diagram(self._table_equity)
+
+    def _hide_table_window(self):
+        self._table_shown = False
+        self.table_window.withdraw()
+
+    def _update_table_diagram(self, equity: Optional[float]):
+        """Push the current table state (and equity, once known) to the diagram."""
+        # Remembered so a diagram opened later starts from the current spot
+        self._table_equity = equity
+        if not self._table_shown:
+            return
+        stage = STAGE_BY_BOARD_LEN.get(len(self._board_cards), "Post-flop")
         self.table_window.update_state(
-            active_players=active_players,
+            active_players=frozenset(self._active_seats),
             hero_seat=self.hero_seat.get(),
             dealer_seat=self.dealer_seat.get(),
-            pot=pot,
-            to_call=to_call,
+            pot_cents=self._pot_cents,
+            to_call_cents=self._call_cents,
             stage=stage,
             equity=equity
         )
 
-    def _clear_output_panels(self):
-        """Clear all output text widgets."""
-        self.analysis_text.delete("1.0", tk.END)
-        self.stats_text.delete("1.0", tk.END)
-
     def _display_welcome_message(self):
         """Display welcome message when no cards are selected."""
-        self.analysis_text.insert("1.0", 
+        self._render(self.analysis_text, [(
             "Welcome to Poker Assistant v16!\n\n"
             "• Click cards or use keyboard shortcuts (e.g., AS for A♠)\n"
             "• Add 2 hole cards to see hand analysis\n"
             "• Toggle players on/off to adjust table dynamics\n"
             "• Add community cards to see updated recommendations\n\n"
-            "Ready to improve your game!")
+            "Ready to improve your game!", "")])
+
+    def _start_analysis(self, hole: List[Card], board: List[Card]) -> Optional[float]:
+        """
+        Show the analysis for this spot. Cached spots are applied at once and
+        their equity returned; anything else runs on the analysis worker and
+        is applied by _on_analysis_done, so the Tk loop never waits on it.
+        """
+        position, stack_bb = self._position, self._stack_bb
+        try:
+            pot, to_call = self.game_state.pot, self.game_state.to_call
+            num_players = self.num_players.get()
+        except Exception as e:
+            self._show_analysis_error(e)
+            return None
+
+        # Preflop the analysis depends only on which of the 169 starting hands
+        # this is, so every suit combination of it shares one cache entry
+        hand_key = card_mask(hole) if board else preflop_class(hole)
+        akey = (hand_key, card_mask(board), position, stack_bb,
+                self._pot_cents, self._call_cents, num_players)
+        spot = (akey, hole, self._board_str, position, stack_bb, pot, to_call)
+        analysis = self._analysis_cache.get(akey)
+        if analysis is not None:
+            # Flipping between a few spots keeps all of them cached
+            self._analysis_cache.move_to_end(akey)
+            self._apply_analysis(spot, analysis)
+            return analysis.equity
+
+        # No decision to attach an action to until the result lands
+        self._last_decision_id = None
+        self.decision_label.config(text="→ Analysing...", fg=C_TEXT_DIM)
+        gen = self._analysis_gen
+        self._analysis_future = self._analysis_exec.submit(
+            analyse_hand, hole=hole, board=board, position=position,
+            stack_bb=stack_bb, pot=pot, to_call=to_call, num_players=num_players
+        )
+        self._analysis_future.add_done_callback(
+            lambda f: self._post_to_ui(self._on_analysis_done, gen, spot, f)
+        )
+        return None
 
-    def _update_analysis_panel(self, hole: List[Card], board: List[Card]) -> HandAnalysis:
-        """Update the analysis panel with hand information."""
+    def _post_to_ui(self, fn, *args):
+        """Hand a worker-thread result to the Tk thread."""
+        if self._closing:
+            return  # nothing left to show it in
         try:
-            analysis = analyse_hand(
-                hole=hole,
-                board=board,
-                position=Position[self.position.get()],
-                stack_type=StackType(self.stack_type.get()),
-                num_players=self.num_players.get(),
-                to_call=self.game_state.to_call,
-                pot=self.game_state.pot,
-                big_blind=self.big_blind.get()
-            )
+            self.after(0, fn, *args)
+        except (RuntimeError, tk.TclError):
+            pass  # window already closed
 
-            # Store for action recording
-            hand_str = to_two_card_str(hole[0], hole[1])
-            decision_id = open_db().execute(
-                "INSERT INTO decisions (hand, position, decision, timestamp) VALUES (?, ?, ?, datetime('now'))",
-                (hand_str, self.position.get(), analysis.decision)
-            ).lastrowid
-            open_db().commit()
-            self._last_decision_id = decision_id
-
-            # Format analysis display
-            self._format_analysis_display(analysis, hole, board)
-            
-            return analysis
-            
-        except Exception as e:
-            log.error(f"Analysis failed: {e}")
-            self.analysis_text.insert("1.0", f"Analysis Error: {e}")
-            return HandAnalysis()
+    def _on_analysis_done(self, gen: int, spot: tuple, future):
+        """Worker finished – cache the result, and show it unless newer inputs superseded it."""
+        if future.cancelled() or self._closing:
+            return
+        exc = future.exception()
+        if exc is None:
+            # Even a superseded result is valid for its own spot; keeping it
+            # makes stepping back to that spot (undoing a card) instant
+            analysis = future.result()
+            cache, akey = self._analysis_cache, spot[0]
+            if akey in cache:
+                cache.move_to_end(akey)
+            elif len(cache) >= self.ANALYSIS_CACHE_SIZE:
+                cache.popitem(last=False)
+            cache[akey] = analysis
+        if gen != self._analysis_gen:
+            return
+        self._analysis_future = None
+        if exc is not None:
+            self._show_analysis_error(exc)
+            return
+        self._apply_analysis(spot, analysis)
+        self._update_stats_panel()
+        self._update_table_diagram(analysis.equity)
+
+    def _apply_analysis(self, spot: tuple, analysis: HandAnalysis):
+        """Record the analysed spot and show it in the panel and decision label."""
+        _, hole, board_str, position, stack_bb, pot, to_call = spot
+        tier = get_hand_tier(hole)
+
+        # Store for action recording – queued in memory, flushed in batches
+        self._last_decision_id = record_decision(
+            analysis, position, tier,
+            stack_bb, pot, to_call, board_str
+        )
+        self._schedule_flush()
+        self._stats_dirty = True
+
+        self._format_analysis_display(analysis, hole, board_str, position, tier)
+        self.decision_label.config(
+            text=f"→ {analysis.decision}",
+            fg=DECISION_COLORS.get(analysis.decision, C_TEXT)
+        )
+
+    def _show_analysis_error(self, exc: BaseException):
+        log.error(f"Analysis failed: {exc}")
+        self._render(self.analysis_text, [(f"Analysis Error: {exc}", "")])
+        self.decision_label.config(text="→ Analysis unavailable", fg=C_TEXT_DIM)
 
-    def _format_analysis_display(self, analysis: HandAnalysis, hole: List[Card], board: List[Card]):
+    def _render(self, widget: tk.Text, parts: List[Tuple[str, str]]):
+        """Show `parts` in `widget`, leaving it untouched if that is already the content."""
+        parts = tuple(parts)
+        if self._rendered.get(widget) == parts:
+            return
+        # One `replace` swaps the old content for every (text, tag) part in a
+        # single Tcl call and layout pass, instead of a delete then an insert
+        args = []
+        for chunk, tag in parts:
+            args += (chunk, tag)
+        widget.replace("1.0", tk.END, *(args or [""]))
+        self._rendered[widget] = parts
+
+    def _format_analysis_display(self, analysis: HandAnalysis, hole: List[Card], board_str: str,
+                                 position: Position, tier: str):
         """Format and display the analysis results."""
-        text = self.analysis_text
-        
-        # Hand info
-        hand_str = f"{hole[0]} {hole[1]}"
-        text.insert(tk.END, f"Your Hand: {hand_str}\n")
-        
-        if board:
-            board_str = " ".join(str(c) for c in board)
-            text.insert(tk.END, f"Board: {board_str}\n")
-        
-        text.insert(tk.END, f"Position: {self.position.get()}\n")
-        text.insert(tk.END, f"Players: {self.num_players.get()}\n\n")
-        
-        # Analysis results
-        text.insert(tk.END, f"Hand Tier: {analysis.tier}\n")
-        text.insert(tk.END, f"Playability: {analysis.playability}/10\n")
-        
-        if analysis.equity:
-            text.insert(tk.END, f"Equity: {analysis.equity:.1f}%\n")
-        
-        if analysis.pot_odds:
-            text.insert(tk.END, f"Pot Odds: {analysis.pot_odds:.1f}%\n")
-        
-        text.insert(tk.END, f"\nRecommendation: {analysis.decision}\n\n")
-        
-        # Reasoning
-        if analysis.reasoning:
-            text.insert(tk.END, "Analysis:\n")
-            for reason in analysis.reasoning:
-                text.insert(tk.END, f"• {reason}\n")
+        parts = [
+            ("Your Hand: ", "heading"), (f"{hole[0]} {hole[1]}  ({tier})\n", ""),
+        ]
+        if board_str:
+            parts += [("Board: ", "heading"),
+                      (f"{board_str}  ({analysis.board_texture})\n", "")]
+        parts += [
+            ("Position: ", "heading"), (f"{position.name}   ", ""),
+            ("Players: ", "heading"), (f"{self.num_players.get()}\n\n", ""),
+            ("Equity: ", "heading"), (f"{analysis.equity:.1%}   ", ""),
+            ("Needed: ", "heading"), (f"{analysis.required_eq:.1%}   ", ""),
+            ("SPR: ", "heading"), (f"{analysis.spr:.1f}\n", ""),
+            ("EV call: ", "heading"), (f"{analysis.ev_call:+.2f}   ", ""),
+            ("EV raise: ", "heading"), (f"{analysis.ev_raise:+.2f}\n\n", ""),
+            ("Recommendation: ", "heading"), (f"{analysis.decision}\n", analysis.decision),
+            (f"{analysis.reason}\n\n", ""),
+            ("Advice:\n", "heading"),
+            (f"• {get_position_advice(position)}\n", ""),
+            (f"• {get_hand_advice(tier, analysis.board_texture, analysis.spr)}\n", ""),
+        ]
+        self._render(self.analysis_text, parts)
 
     def _update_stats_panel(self):
-        """Update session statistics."""
+        """Update session statistics, but only after a decision changed them."""
+        if not self._stats_dirty:
+            return
+        self._stats_dirty = False
         try:
-            db = open_db()
-            cursor = db.execute(
-                "SELECT decision, COUNT(*) FROM decisions WHERE date(timestamp) = date('now') GROUP BY decision"
-            )
-            stats = dict(cursor.fetchall())
+            stats = decision_counts_today()
             
             total = sum(stats.values())
             if total > 0:
-                self.stats_text.insert("1.0", f"Today's Decisions ({total} hands):\n")
+                parts = [(f"Today's Decisions ({total} hands):\n", "heading")]
                 for action in ["FOLD", "CALL", "RAISE", "CHECK"]:
                     count = stats.get(action, 0)
                     pct = (count / total * 100) if total > 0 else 0
-                    self.stats_text.insert(tk.END, f"{action}: {count} ({pct:.1f}%)  ")
+                    parts += [(f"{action}", action), (f": {count} ({pct:.1f}%)  ", "")]
             else:
-                self.stats_text.insert("1.0", "No decisions recorded today yet.")
+                parts = [("No decisions recorded today yet.", "")]
                 
         except Exception as e:
             log.error(f"Stats update failed: {e}")
-            self.stats_text.insert("1.0", "Stats unavailable")
+            parts = [("Stats unavailable", "")]
+        self._render(self.stats_text, parts)
 
 
 if __name__ == "__main__":
@@ -865,4 +1229,5 @@ if __name__ == "__main__":
         app.mainloop()
     except Exception as e:
         log.error("Unhandled exception", exc_info=True)
+        from tkinter import messagebox
         messagebox.showerror("Fatal Error", f"A critical error occurred: {e}")
\ No newline at end of file
@@ -5,17 +5,83 @@ Initialisation / persistence layer for Poker-Assistant.
 * Creates the sqlite database the first time the app is launched
 * Offers open_db() + record_decision() helpers that the GUI can import
 """
+import atexit
+import itertools
 import sqlite3
 import logging
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple, TypeVar
 
 # Local imports after project structure is clear
 from poker_modules import HandAnalysis, Position
 
 log = logging.getLogger(__name__)
+T = TypeVar("T")
 DB_FILE = "poker_decisions.db"
 
+# One long-lived connection: reconnecting per call re-opens the file and
+# throws away SQLite's page cache. Writers may run on a worker thread, so
+# the connection is shareable and writes are serialised by _DB_LOCK, which
+# is held for whole transactions (lock retries included) and also guards
+# _ROWIDS. The Tk thread never takes it.
+_DB_CON: Optional[sqlite3.Connection] = None
+_DB_LOCK = threading.RLock()
+# Stats are read on the Tk thread. Under WAL a second connection can read
+# while the writer commits, so reads get their own and never wait for a flush.
+_READ_CON: Optional[sqlite3.Connection] = None
+_READ_LOCK = threading.Lock()
+
+# Write-behind queue: decisions wait in memory and flush_decisions() writes
+# them with one executemany, so a burst of actions costs a single commit.
+# Callers get a session-local id straight away; the row-id is only chosen
+# inside the flush transaction, so another writer to the same file can
+# never make a queued batch collide. _ROWIDS maps flushed ids to row-ids
+# for later update_decision() calls.
+# _QUEUE_LOCK guards _PENDING and _WRITE_GEN. Apart from the COMMIT that
+# publishes a write it is only held for dict operations, so recording or
+# counting on the Tk thread never waits for a flush's transaction.
+_PENDING: Dict[int, list] = {}
+_QUEUE_LOCK = threading.Lock()
+# Bumped with every commit; the cached day counts are keyed on it, so a
+# count read before a write can never be served after it
+_WRITE_GEN = 0
+_LOCAL_IDS = itertools.count(1)
+_ROWIDS: Dict[int, int] = {}
+_ROWIDS_SIZE = 1024
+_ROW_TIMESTAMP, _ROW_DECISION = 0, 7
+# Connections run in autocommit mode (isolation_level=None) and writes open
+# their own BEGIN IMMEDIATE, so sqlite3 never wraps statements in implicit
+# transactions. Taking the write lock can race another process; retry briefly.
+_LOCK_RETRIES = 3
+_LOCK_RETRY_DELAY = 0.01  # seconds
+
+# Statement text lives in one place so every call hands sqlite3 the same
+# string and hits its per-connection prepared-statement cache.
+_SQL_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-4000;  -- ~4 MB page cache
+"""
+# Serves _SQL_COUNTS_FOR_DAY straight from the index: the expression matches
+# its WHERE clause and `decision` covers the GROUP BY, so no table rows or
+# temp b-tree are touched. IF NOT EXISTS also upgrades older database files.
+_SQL_INDEXES = """
+    CREATE INDEX IF NOT EXISTS idx_decisions_day
+        ON decisions(date(timestamp), decision);
+"""
+_SQL_NEXT_ID = "SELECT COALESCE(MAX(id), 0) + 1 FROM decisions"
+_SQL_INSERT = """INSERT INTO decisions
+                 (id, timestamp, position, hand_tier, stack_bb, pot, to_call, board,
+                  decision, spr, board_texture)
+                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+_SQL_UPDATE_DECISION = "UPDATE decisions SET decision = ? WHERE id = ?"
+_SQL_COUNTS_FOR_DAY = ("SELECT decision, COUNT(*) FROM decisions "
+                       "WHERE date(timestamp) = ? GROUP BY decision")
+
 # ──────────────────────────────────────────────────────
 #  Database bootstrap
 # ──────────────────────────────────────────────────────
@@ -42,9 +108,51 @@ def _create_schema(conn: sqlite3.Connection) -> None:
 
 
 def open_db() -> sqlite3.Connection:
-    """Return a live sqlite3 connection."""
-    initialise_db_if_needed()
-    return sqlite3.connect(DB_FILE)
+    """Return the shared sqlite3 connection, opening it on first use."""
+    global _DB_CON
+    with _DB_LOCK:
+        if _DB_CON is None:
+            initialise_db_if_needed()
+            conn = sqlite3.connect(DB_FILE, check_same_thread=False,
+                                   detect_types=0, isolation_level=None)
+            conn.executescript(_SQL_PRAGMAS + _SQL_INDEXES)
+            _DB_CON = conn
+        return _DB_CON
+
+
+def _open_reader() -> sqlite3.Connection:
+    """Return the read-only-use connection, opening it on first use."""
+    global _READ_CON
+    if _READ_CON is None:
+        # Not via open_db(): that would wait on _DB_LOCK behind a flush
+        initialise_db_if_needed()
+        conn = sqlite3.connect(DB_FILE, check_same_thread=False,
+                               detect_types=0, isolation_level=None)
+        conn.executescript(_SQL_PRAGMAS)
+        _READ_CON = conn
+    return _READ_CON
+
+
+def close_db() -> None:
+    """Flush queued decisions and close both connections."""
+    global _DB_CON, _READ_CON
+    try:
+        with _DB_LOCK:
+            try:
+                flush_decisions()
+                if _DB_CON is not None:
+                    # Let SQLite refresh its planner statistics while it is cheap
+                    _DB_CON.execute("PRAGMA optimize")
+            finally:
+                # A failed flush is re-raised, but never leaves the file open
+                if _DB_CON is not None:
+                    _DB_CON.close()
+                    _DB_CON = None
+    finally:
+        with _READ_LOCK:
+            if _READ_CON is not None:
+                _READ_CON.close()
+                _READ_CON = None
 
 
 def initialise_db_if_needed() -> None:
@@ -54,6 +162,37 @@ def initialise_db_if_needed() -> None:
             _create_schema(conn)
 
 
+def _write(work: Callable[[sqlite3.Connection], T],
+           on_commit: Optional[Callable[[T], None]] = None) -> T:
+    """
+    Run `work(db)` in its own BEGIN IMMEDIATE transaction and commit it.
+    The COMMIT, the _WRITE_GEN bump and `on_commit(result)` happen together
+    under _QUEUE_LOCK, so a stats read sees all of them or none.
+    """
+    global _WRITE_GEN
+    db = open_db()
+    for attempt in range(_LOCK_RETRIES):
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            break
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e) or attempt == _LOCK_RETRIES - 1:
+                raise
+            time.sleep(_LOCK_RETRY_DELAY)
+    try:
+        result = work(db)
+        with _QUEUE_LOCK:
+            db.execute("COMMIT")
+            _WRITE_GEN += 1
+            if on_commit is not None:
+                on_commit(result)
+    except BaseException:
+        if db.in_transaction:
+            db.execute("ROLLBACK")
+        raise
+    return result
+
+
 # ──────────────────────────────────────────────────────
 #  Public helpers used by the rest of the program
 # ──────────────────────────────────────────────────────
@@ -61,22 +200,100 @@ def record_decision(
     analysis: HandAnalysis, position: Position, tier: str,
     stack_bb: int, pot: float, to_call: float, board: str
 ) -> int:
-    """Persist a decision and return its row-id."""
-    with open_db() as db:
-        cur = db.execute(
-            """INSERT INTO decisions
-               (position, hand_tier, stack_bb, pot, to_call, board, decision, spr, board_texture)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                position.name, tier, stack_bb, pot, to_call, board,
-                analysis.decision, analysis.spr, analysis.board_texture
-            )
-        )
-        return cur.lastrowid
+    """Queue a decision for the next flush and return its id for update_decision()."""
+    with _QUEUE_LOCK:
+        decision_id = next(_LOCAL_IDS)
+        # Same text as CURRENT_TIMESTAMP (UTC), stamped now rather than at flush;
+        # a plain string, so sqlite3 binds it without a datetime adapter
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+        _PENDING[decision_id] = [
+            timestamp, position.name, tier, stack_bb, pot, to_call, board,
+            analysis.decision, analysis.spr, analysis.board_texture
+        ]
+    return decision_id
+
+
+def update_decision(decision_id: int, decision: str) -> None:
+    """Overwrite a stored decision with the action the player actually took."""
+    # _DB_LOCK first: a flush in progress has then either left the row
+    # queued or finished mapping it to its row-id
+    with _DB_LOCK:
+        with _QUEUE_LOCK:
+            row = _PENDING.get(decision_id)
+            if row is not None:
+                row[_ROW_DECISION] = decision
+                return
+        rowid = _ROWIDS.get(decision_id)
+        if rowid is None:
+            log.warning("Decision %s is no longer tracked; update dropped", decision_id)
+            return
+        _write(lambda db: db.execute(_SQL_UPDATE_DECISION, (decision, rowid)))
+
+
+def flush_decisions() -> int:
+    """Write every queued decision in one transaction; returns the row count."""
+    with _DB_LOCK:
+        with _QUEUE_LOCK:
+            if not _PENDING:
+                return 0
+            batch = list(_PENDING.items())
+
+        def insert(db: sqlite3.Connection) -> int:
+            # BEGIN IMMEDIATE holds the write lock, so nobody can take these
+            # ids between the SELECT and the INSERT
+            first = db.execute(_SQL_NEXT_ID).fetchone()[0]
+            db.executemany(_SQL_INSERT, [(first + i, *row)
+                                         for i, (_, row) in enumerate(batch)])
+            return first
+
+        def dequeue(_first: int) -> None:
+            for decision_id, _ in batch:
+                del _PENDING[decision_id]
+
+        # The write runs without _QUEUE_LOCK, so decisions can still be queued
+        # meanwhile. Only the written ids are dequeued, in the same step as
+        # the commit: on failure the batch stays queued for the next flush.
+        first = _write(insert, on_commit=dequeue)
+        for i, (decision_id, _) in enumerate(batch):
+            if len(_ROWIDS) >= _ROWIDS_SIZE:
+                del _ROWIDS[next(iter(_ROWIDS))]
+            _ROWIDS[decision_id] = first + i
+    return len(batch)
+
+
+def pending_decision_count() -> int:
+    """Number of decisions queued and not yet written."""
+    return len(_PENDING)
+
+
+@lru_cache(maxsize=1)
+def _counts_for_day(day: str, write_gen: int) -> Tuple[Tuple[str, int], ...]:
+    with _READ_LOCK:
+        return tuple(_open_reader().execute(_SQL_COUNTS_FOR_DAY, (day,)).fetchall())
+
+
+def decision_counts_today() -> Dict[str, int]:
+    """Return today's {decision: count}, cached until the next write."""
+    # SQLite's CURRENT_TIMESTAMP is UTC, so key the cache on the UTC date.
+    today = time.strftime("%Y-%m-%d", time.gmtime())
+    while True:
+        with _QUEUE_LOCK:
+            write_gen = _WRITE_GEN
+            queued = [row[_ROW_DECISION] for row in _PENDING.values()
+                      if row[_ROW_TIMESTAMP].startswith(today)]
+        counts = dict(_counts_for_day(today, write_gen))
+        # A commit during the query may have written rows that are also in
+        # `queued`; the generation moved, so read again against the new one
+        if write_gen == _WRITE_GEN:
+            break
+    for decision in queued:
+        counts[decision] = counts.get(decision, 0) + 1
+    return counts
 
 # Make sure the DB exists right after import
 initialise_db_if_needed()
+# ...and that nothing queued is lost when the process exits
+atexit.register(flush_decisions)
 
 if __name__ == "__main__":
     print("Database ready at", Path(DB_FILE).absolute())
\ No newline at end of file
@@ -11,14 +11,16 @@ alternative front-ends later without touching the GUI itself.
 """
 import logging
 
-# Ensure the database exists (side-effect is cheap / idempotent)
-from poker_init import initialise_db_if_needed
-initialise_db_if_needed()
+if __name__ == "__main__":
+    # Everything happens under the guard: spawned simulation workers import
+    # this module as __mp_main__ and must not touch the DB or Tk.
+    # Ensure the database exists (side-effect is cheap / idempotent)
+    from poker_init import initialise_db_if_needed
+    initialise_db_if_needed()
 
-# Import the GUI after the DB is ready
-from poker_gui import PokerAssistant
+    # Import the GUI after the DB is ready
+    from poker_gui import PokerAssistant
 
-if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     app = PokerAssistant()
     app.mainloop()
\ No newline at end of file
@@ -7,7 +7,14 @@ from enum import Enum
 from dataclasses import dataclass, field
 from typing import List, Optional, Tuple, Set, Dict
 from collections import Counter
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import math
+import multiprocessing
+import os
 import random
+import threading
 
 # ──────────────────────────────────────────────────────
 #  Core domain objects
@@ -32,6 +39,8 @@ class Rank(Enum):
 # Define constants that depend on Rank first.
 RANKS_MAP = {r.val: r for r in Rank}
 RANK_ORDER = [r.val for r in Rank]
+# rank char -> index, so hot loops never pay for RANK_ORDER.index()
+_RANK_INDEX = {r: i for i, r in enumerate(RANK_ORDER)}
 
 # Now define Card, which depends on Suit, Rank, and RANK_ORDER.
 @dataclass(frozen=True, order=True)
@@ -41,13 +50,36 @@ class Card:
 
     @property
     def rank_val(self) -> int:
-        return RANK_ORDER.index(self.rank)
+        return _RANK_INDEX[self.rank]
 
     def __str__(self) -> str:
         return f"{self.rank}{self.suit.value}"
 
 # Finally, define FULL_DECK which depends on the Card class.
 FULL_DECK = [Card(r.val, s) for s in Suit for r in Rank]
+# Every card as an int 0..51 and back. Card sets become 52-bit masks, which
+# hash and compare far cheaper than tuples of Card objects.
+CARD_INDEX: Dict[Card, int] = {c: i for i, c in enumerate(FULL_DECK)}
+INDEX_CARD: Tuple[Card, ...] = tuple(FULL_DECK)
+# One shared Card per (rank, suit): look cards up here instead of building
+# fresh ones, so the same card is always the same object.
+CARD_BY_RANK_SUIT: Dict[Tuple[str, Suit], Card] = {(c.rank, c.suit): c for c in FULL_DECK}
+# Card from its text, either as displayed ("A♠") or as typed ("AS")
+CARD_BY_CODE: Dict[str, Card] = {
+    **{str(c): c for c in FULL_DECK},
+    **{c.rank + c.suit.name[0]: c for c in FULL_DECK},
+}
+
+def card_mask(cards) -> int:
+    """52-bit mask with bit CARD_INDEX[c] set for every card in `cards`."""
+    mask = 0
+    for c in cards:
+        mask |= 1 << CARD_INDEX[c]
+    return mask
+
+def cards_from_mask(mask: int) -> List[Card]:
+    """The cards whose bits are set in `mask`, in FULL_DECK order."""
+    return [INDEX_CARD[i] for i in range(52) if mask >> i & 1]
 
 class Position(Enum):
     SB    = 1
@@ -183,6 +215,119 @@ def check_straight(ranks: List[int]) -> Tuple[bool, int]:
             return (True, unique_ranks[i])
     return (False, -1)
 
+def _straight_high(rank_mask: int) -> int:
+    """Top rank of the best straight in a 13-bit rank mask, or -1 if none."""
+    # Shift up one and mirror the ace into bit 0 so the wheel is an ordinary run
+    m = (rank_mask << 1) | (rank_mask >> 12 & 1)
+    for top in range(13, 3, -1):
+        if (m >> (top - 4)) & 0x1F == 0x1F:
+            return top - 1
+    return -1
+
+def _top_ranks(rank_mask: int, n: int) -> List[int]:
+    """The `n` highest ranks present in a 13-bit rank mask, highest first."""
+    out = []
+    r = 12
+    while r >= 0 and len(out) < n:
+        if rank_mask >> r & 1:
+            out.append(r)
+        r -= 1
+    return out
+
+# Both questions the evaluator asks of a 13-bit rank mask, answered once for
+# all 8192 masks so hand scoring does table reads instead of rank loops
+_STRAIGHT_HIGH: Tuple[int, ...] = tuple(_straight_high(m) for m in range(1 << 13))
+_RANKS_DESC: Tuple[Tuple[int, ...], ...] = tuple(tuple(_top_ranks(m, 13)) for m in range(1 << 13))
+
+def _pack_strength(category: HandRank, kickers: Tuple[int, ...]) -> int:
+    """Category in the top nibble, then up to five 4-bit kickers."""
+    score = category.value
+    for i in range(5):
+        score = (score << 4) | (kickers[i] if i < len(kickers) else 0)
+    return score
+
+# A tallied card set: rank masks of ranks seen at least 1/2/3/4 times, plus
+# the rank mask of every suit. Ints are immutable, so extending a tally only
+# copies the small suit dict.
+_CardTally = Tuple[int, int, int, int, Dict[Suit, int]]
+_EMPTY_TALLY: _CardTally = (0, 0, 0, 0, {})
+
+def _tally(cards: List[Card], base: _CardTally = _EMPTY_TALLY) -> _CardTally:
+    """Return `base` with `cards` added; `base` itself is left untouched."""
+    seen1, seen2, seen3, seen4, suit_masks = base
+    suit_masks = dict(suit_masks)
+    for c in cards:
+        bit = 1 << _RANK_INDEX[c.rank]
+        if seen1 & bit:
+            if seen2 & bit:
+                if seen3 & bit:
+                    seen4 |= bit
+                else:
+                    seen3 |= bit
+            else:
+                seen2 |= bit
+        else:
+            seen1 |= bit
+        suit_masks[c.suit] = suit_masks.get(c.suit, 0) | bit
+    return seen1, seen2, seen3, seen4, suit_masks
+
+def hand_strength(hole: List[Card], board: List[Card]) -> int:
+    """
+    Integer strength of the best 5-card hand – higher beats lower, equal ties.
+    Same categories as get_hand_rank, but built from bit masks so the equity
+    simulations can compare hands with a single int comparison.
+    """
+    return _tally_strength(_tally(hole, _tally(board)))
+
+def _tally_strength(tally: _CardTally) -> int:
+    """hand_strength of an already tallied card set."""
+    rank_mask, seen2, seen3, quads_mask, suit_masks = tally
+
+    flush_mask = 0
+    for m in suit_masks.values():
+        if m.bit_count() >= 5:
+            flush_mask = m
+            break
+
+    if flush_mask:
+        high = _STRAIGHT_HIGH[flush_mask]
+        if high >= 0:
+            return _pack_strength(HandRank.STRAIGHT_FLUSH, (high,))
+
+    # Exact multiplicities, highest rank first
+    quads = _RANKS_DESC[quads_mask]
+    trips = _RANKS_DESC[seen3 & ~quads_mask]
+    pairs = _RANKS_DESC[seen2 & ~seen3]
+
+    if quads:
+        kicker = _RANKS_DESC[rank_mask & ~(1 << quads[0])][:1]
+        return _pack_strength(HandRank.FOUR_OF_A_KIND, (quads[0],) + kicker)
+
+    if trips and (pairs or len(trips) > 1):
+        pair = max(pairs[0] if pairs else -1, trips[1] if len(trips) > 1 else -1)
+        return _pack_strength(HandRank.FULL_HOUSE, (trips[0], pair))
+
+    if flush_mask:
+        return _pack_strength(HandRank.FLUSH, _RANKS_DESC[flush_mask][:5])
+
+    high = _STRAIGHT_HIGH[rank_mask]
+    if high >= 0:
+        return _pack_strength(HandRank.STRAIGHT, (high,))
+
+    if trips:
+        kickers = _RANKS_DESC[rank_mask & ~(1 << trips[0])][:2]
+        return _pack_strength(HandRank.THREE_OF_A_KIND, (trips[0],) + kickers)
+
+    if len(pairs) >= 2:
+        kicker = _RANKS_DESC[rank_mask & ~(1 << pairs[0]) & ~(1 << pairs[1])][:1]
+        return _pack_strength(HandRank.TWO_PAIR, (pairs[0], pairs[1]) + kicker)
+
+    if pairs:
+        kickers = _RANKS_DESC[rank_mask & ~(1 << pairs[0])][:3]
+        return _pack_strength(HandRank.PAIR, (pairs[0],) + kickers)
+
+    return _pack_strength(HandRank.HIGH_CARD, _RANKS_DESC[rank_mask][:5])
+
 # ──────────────────────────────────────────────────────
 #  Equity and Analysis Logic
 # ──────────────────────────────────────────────────────
@@ -195,18 +340,50 @@ HAND_TIERS = {
     "WEAK": {} # Everything else
 }
 
+# Reverse index of HAND_TIERS; the first (strongest) tier listing a code wins
+_TIER_BY_CODE: Dict[str, str] = {}
+for _tier, _codes in HAND_TIERS.items():
+    for _code in _codes:
+        _TIER_BY_CODE.setdefault(_code, _tier)
+
+def _tier_for_code(hi: str, lo: str, suited: bool) -> str:
+    if hi == lo:
+        return _TIER_BY_CODE.get(hi + lo, "WEAK")
+    if suited:
+        return _TIER_BY_CODE.get(f"{hi}{lo}s", "WEAK")
+    return _TIER_BY_CODE.get(f"{hi}{lo}o") or _TIER_BY_CODE.get(f"{lo}{hi}o", "WEAK")
+
+# Only 169 distinct starting hands exist: tabulate them as
+# _TIER_TABLE[high rank][low rank][suited] so a lookup is three indexes
+_TIER_TABLE = tuple(
+    tuple(
+        (_tier_for_code(RANK_ORDER[hi], RANK_ORDER[lo], False),
+         _tier_for_code(RANK_ORDER[hi], RANK_ORDER[lo], True))
+        for lo in range(13)
+    )
+    for hi in range(13)
+)
+
+def preflop_class(hole_cards: List[Card]) -> Tuple[int, int, bool]:
+    """(high rank index, low rank index, suited): which of the 169 starting hands this is."""
+    c1, c2 = hole_cards
+    r1, r2 = _RANK_INDEX[c1.rank], _RANK_INDEX[c2.rank]
+    if r1 < r2: r1, r2 = r2, r1
+    return r1, r2, c1.suit == c2.suit
+
 def get_hand_tier(hole_cards: List[Card]) -> str:
     if len(hole_cards) != 2: return "UNKNOWN"
-    c1, c2 = sorted(hole_cards, key=lambda c: c.rank_val, reverse=True)
-    suited = "s" if c1.suit == c2.suit else "o"
-    if c1.rank == c2.rank: suited = ""
-    hand_str_generic = f"{c1.rank}{c2.rank}{suited}"
-    hand_str_offsuit = f"{c2.rank}{c1.rank}o"
-    
-    for tier, hands in HAND_TIERS.items():
-        if hand_str_generic in hands or (suited == "o" and hand_str_offsuit in hands):
-            return tier
-    return "WEAK"
+    hi, lo, suited = preflop_class(hole_cards)
+    return _TIER_TABLE[hi][lo][suited]
+
+# One fixed combo per starting hand. Suits are interchangeable before the
+# flop, so every combo of a class has the same preflop equity as this one.
+_PREFLOP_REP = {
+    (hi, lo, suited): (CARD_BY_RANK_SUIT[RANK_ORDER[hi], Suit.SPADE],
+                       CARD_BY_RANK_SUIT[RANK_ORDER[lo], Suit.SPADE if suited else Suit.HEART])
+    for hi in range(13) for lo in range(hi + 1) for suited in (False, True)
+    if not (suited and hi == lo)
+}
 
 def get_opponent_range(tier: str) -> Set[str]:
     if tier == "TIGHT":
@@ -216,136 +393,320 @@ def get_opponent_range(tier: str) -> Set[str]:
     # "LOOSE" includes almost everything
     return set().union(*HAND_TIERS.values())
 
-def calculate_equity_monte_carlo(
-    hole: List[Card], 
-    board: List[Card], 
-    num_opponents: int,
-    opponent_range_tier: str = "MEDIUM",
-    num_simulations: int = 2000
-) -> float:
-    
-    known_cards = set(hole + board)
-    deck = [c for c in FULL_DECK if c not in known_cards]
-    
-    if len(deck) < 2 * num_opponents + (5 - len(board)):
-        return 0.5  # Not enough cards
-    
-    opponent_range_cards = []
-    opp_range_str = get_opponent_range(opponent_range_tier)
-    
-    for hand_str in opp_range_str:
-        r1_val, r2_val = hand_str[0], hand_str[1]
-        
-        # Check if the cards for this hand combo are even in the deck
-        possible_in_deck = sum(1 for c in deck if c.rank == r1_val) >= (2 if r1_val == r2_val else 1) and \
-                           sum(1 for c in deck if c.rank == r2_val) >= 1
-        if not possible_in_deck:
-            continue
+@lru_cache(maxsize=None)
+def _range_combos(tier: str) -> Tuple[Tuple[Card, Card], ...]:
+    """Every concrete two-card combo in an opponent range, built once per tier."""
+    combos = []
+    by_rank: Dict[str, List[Card]] = {}
+    for c in FULL_DECK:
+        by_rank.setdefault(c.rank, []).append(c)
 
+    for hand_str in get_opponent_range(tier):
+        r1_val, r2_val = hand_str[0], hand_str[1]
         if len(hand_str) == 3 and hand_str[2] == 's': # Suited
             for s in Suit:
-                c1, c2 = Card(r1_val, s), Card(r2_val, s)
-                if c1 in deck and c2 in deck:
-                    opponent_range_cards.append([c1, c2])
-        else: # Pair or off-suit
-            all_r1s = [c for c in deck if c.rank == r1_val]
-            all_r2s = [c for c in deck if c.rank == r2_val]
-            if r1_val == r2_val: # Pair
-                for i in range(len(all_r1s)):
-                    for j in range(i + 1, len(all_r1s)):
-                        opponent_range_cards.append([all_r1s[i], all_r1s[j]])
-            else: # Offsuit
-                for c1 in all_r1s:
-                    for c2 in all_r2s:
-                        if c1.suit != c2.suit:
-                           opponent_range_cards.append([c1,c2])
-
-
-    if not opponent_range_cards: return 0.5 # fallback
-
+                combos.append((CARD_BY_RANK_SUIT[r1_val, s], CARD_BY_RANK_SUIT[r2_val, s]))
+        elif r1_val == r2_val: # Pair
+            pair_cards = by_rank[r1_val]
+            for i in range(len(pair_cards)):
+                for j in range(i + 1, len(pair_cards)):
+                    combos.append((pair_cards[i], pair_cards[j]))
+        else: # Offsuit
+            for c1 in by_rank[r1_val]:
+                for c2 in by_rank[r2_val]:
+                    if c1.suit != c2.suit:
+                        combos.append((c1, c2))
+    return tuple(combos)
+
+def _draw_range_hand(range_masks: List[int], dealt: int, rng, attempts: int = 32) -> int:
+    """Index of a uniformly chosen range hand sharing no card with the `dealt` mask, or -1."""
+    n = len(range_masks)
+    # Rejection sampling is O(1) per draw while collisions are rare
+    for _ in range(attempts):
+        k = int(rng.random() * n)
+        if not range_masks[k] & dealt:
+            return k
+    free = [k for k in range(n) if not range_masks[k] & dealt]
+    return rng.choice(free) if free else -1
+
+def _draw_cards(deck: List[Card], deck_bits: List[int], dealt: int, count: int,
+                rng) -> Tuple[List[Card], int]:
+    """Draw `count` distinct deck cards outside `dealt`; returns them and the grown mask."""
+    drawn = []
+    n = len(deck)
+    while len(drawn) < count:
+        k = int(rng.random() * n)
+        bit = deck_bits[k]
+        if not dealt & bit:
+            dealt |= bit
+            drawn.append(deck[k])
+    return drawn, dealt
+
+def _simulate(hole: List[Card], board: List[Card], deck: List[Card],
+              opponent_range_cards: List[Tuple[Card, Card]], num_opponents: int,
+              num_simulations: int, rng) -> Tuple[int, int, int]:
+    """Run `num_simulations` random run-outs and return (wins, ties, valid_sims)."""
     wins = 0
     ties = 0
     valid_sims = 0
 
+    needed = 5 - len(board)
+    # On a complete board the hero's hand never changes – evaluate it once
+    fixed_score = hand_strength(hole, board) if needed == 0 else None
+    # The known board is the same in every run-out: tally it once and only
+    # add the random cards (then each player's hole cards) on top of it
+    board_tally = _tally(board)
+    # Dealt cards are tracked as one 52-bit int, so "is it free?" is a
+    # single AND and nothing is re-filtered per simulation
+    deck_bits = [1 << CARD_INDEX[c] for c in deck]
+    range_masks = [card_mask(h) for h in opponent_range_cards]
+    deck_size = len(deck)
+
     for _ in range(num_simulations):
-        random.shuffle(deck)
-        sim_deck = list(deck)
-        
-        # Deal hands to opponents
+        # Deal hands to opponents. The range list is built from `deck`, so
+        # every card dealt here is a deck card too.
         opp_hands = []
-        possible_opp_hands = [h for h in opponent_range_cards if h[0] in sim_deck and h[1] in sim_deck]
-        random.shuffle(possible_opp_hands)
-        
-        dealt_cards = set()
+        dealt = 0
         skip_sim = False
         for _ in range(num_opponents):
-            hand_found = False
-            # Try to find a hand from the range that doesn't conflict with cards already dealt to other opponents
-            for hand_candidate in possible_opp_hands:
-                if hand_candidate[0] not in dealt_cards and hand_candidate[1] not in dealt_cards:
-                    opp_hands.append(hand_candidate)
-                    dealt_cards.update(hand_candidate)
-                    # Remove cards from sim_deck
-                    sim_deck.remove(hand_candidate[0])
-                    sim_deck.remove(hand_candidate[1])
-                    hand_found = True
-                    break
-            if not hand_found: # Could not find a hand from the range
-                if len(sim_deck) >= 2:
-                    hand = [sim_deck.pop(), sim_deck.pop()]
-                    opp_hands.append(hand)
-                else:
-                    skip_sim = True
-                    break
+            k = _draw_range_hand(range_masks, dealt, rng)
+            if k >= 0:
+                hand = opponent_range_cards[k]
+                dealt |= range_masks[k]
+            elif deck_size - dealt.bit_count() >= 2: # Range exhausted – any two cards
+                hand, dealt = _draw_cards(deck, deck_bits, dealt, 2, rng)
+            else:
+                skip_sim = True
+                break
+            opp_hands.append(hand)
         
         if skip_sim:
             continue
 
-        # Draw board
-        needed = 5 - len(board)
-        if len(sim_deck) < needed:
+        # Draw board from whatever the opponents left behind
+        if deck_size - dealt.bit_count() < needed:
             continue
-        sim_board = board + sim_deck[:needed]
+        runout, dealt = _draw_cards(deck, deck_bits, dealt, needed, rng)
+        sim_tally = _tally(runout, board_tally)
 
-        my_rank = get_hand_rank(hole, sim_board)
-        best_opp_rank = (HandRank.HIGH_CARD, [-1])
+        my_score = fixed_score if fixed_score is not None else _tally_strength(_tally(hole, sim_tally))
+        best_opp_score = -1
 
         for opp_hand in opp_hands:
-            opp_rank = get_hand_rank(opp_hand, sim_board)
-            if opp_rank > best_opp_rank:
-                best_opp_rank = opp_rank
+            opp_score = _tally_strength(_tally(opp_hand, sim_tally))
+            if opp_score > best_opp_score:
+                best_opp_score = opp_score
         
-        if my_rank > best_opp_rank:
+        if my_score > best_opp_score:
             wins += 1
-        elif my_rank == best_opp_rank:
+        elif my_score == best_opp_score:
             ties += 1
         
         valid_sims += 1
 
+    return wins, ties, valid_sims
+
+def _simulate_chunk(args: tuple) -> Tuple[int, int, int]:
+    """Process-pool entry point: same as _simulate with a private, seeded RNG."""
+    *sim_args, seed = args
+    return _simulate(*sim_args, random.Random(seed))
+
+# Simulations are independent, so big fixed-budget runs are split across
+# processes. Early-stopping runs (everything analyse_hand does) stay serial.
+# Below the threshold, process start-up and pickling cost more than they save.
+_MC_WORKERS = os.cpu_count() or 1
+_PARALLEL_MIN_SIMS = 2000
+_POOL: Optional[ProcessPoolExecutor] = None
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _POOL
+    if _POOL is None:
+        # Never fork the caller: it may be a GUI worker thread while other
+        # threads hold locks. A fork server (spawn where there is none) starts
+        # workers from a clean single-threaded process. Workers still import
+        # the launching script as __mp_main__, so entry points keep their
+        # side effects under the __main__ guard.
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            ctx = multiprocessing.get_context("forkserver")
+            ctx.set_forkserver_preload([__name__])
+        else:
+            ctx = multiprocessing.get_context("spawn")
+        _POOL = ProcessPoolExecutor(max_workers=_MC_WORKERS, mp_context=ctx)
+    return _POOL
+
+def _simulate_parallel(hole: List[Card], board: List[Card], deck: List[Card],
+                       opponent_range_cards: List[Tuple[Card, Card]], num_opponents: int,
+                       num_simulations: int) -> Tuple[int, int, int]:
+    """Split the simulations across the process pool and sum the tallies."""
+    base, extra = divmod(num_simulations, _MC_WORKERS)
+    # Seeds come from the global RNG so random.seed() still makes runs repeatable
+    jobs = [
+        (hole, board, deck, opponent_range_cards, num_opponents,
+         base + (1 if i < extra else 0), random.getrandbits(64))
+        for i in range(_MC_WORKERS)
+    ]
+    results = list(_get_pool().map(_simulate_chunk, jobs))
+    return tuple(sum(col) for col in zip(*results))
+
+# Sequential sampling: batches are small enough that a clear-cut spot stops
+# after a few hundred run-outs instead of the full budget.
+_SEQ_CHUNK = 200
+_SEQ_Z = 3.0         # stop once every decision point is this many SEs away
+_SEQ_MIN_SE = 0.01   # ...or once the estimate is this tight regardless
+
+# Run-outs already simulated per spot. When only the decision points change
+# (the pot or the bet was edited) a sequential run resumes from these, and
+# often needs no new samples at all.
+# Updated on the GUI's analysis thread and cleared from the Tk thread, so
+# every access goes through _SPOT_TALLY_LOCK (never held while simulating).
+_SPOT_TALLY: Dict[tuple, Tuple[int, int, int]] = {}
+_SPOT_TALLY_SIZE = 4096
+_SPOT_TALLY_LOCK = threading.Lock()
+
+def _simulate_until_decided(hole: List[Card], board: List[Card], deck: List[Card],
+                            opponent_range_cards: List[Tuple[Card, Card]], num_opponents: int,
+                            num_simulations: int,
+                            decision_points: Tuple[float, ...],
+                            start: Tuple[int, int, int] = (0, 0, 0)) -> Tuple[int, int, int]:
+    """
+    Simulate in chunks until the equity is clearly on one side of every decision point.
+    Always serial: a clear-cut spot stops after one _SEQ_CHUNK, far less work
+    than shipping the deck and range to pool workers would cost.
+    """
+    wins, ties, valid_sims = start
+    done = valid_sims
+    while True:
+        if valid_sims:
+            p = (wins + ties / 2) / valid_sims
+            se = math.sqrt(p * (1 - p) / valid_sims)
+            if se < _SEQ_MIN_SE or all(abs(p - d) > _SEQ_Z * se for d in decision_points):
+                break
+        if done >= num_simulations:
+            break
+        n = min(_SEQ_CHUNK, num_simulations - done)
+        w, t, v = _simulate(hole, board, deck, opponent_range_cards, num_opponents, n, random)
+        wins, ties, valid_sims, done = wins + w, ties + t, valid_sims + v, done + n
+    return wins, ties, valid_sims
+
+def calculate_equity_monte_carlo(
+    hole: List[Card], 
+    board: List[Card], 
+    num_opponents: int,
+    opponent_range_tier: str = "MEDIUM",
+    num_simulations: int = 2000,
+    decision_points: Tuple[float, ...] = ()
+) -> float:
+    """
+    Monte-Carlo equity of `hole` against `num_opponents` drawn from the range.
+    Results are memoised per card set, so repeating a spot (every GUI refresh
+    does) returns the first estimate instead of re-simulating it.
+
+    With `decision_points` (equities where the caller's decision flips) the
+    run stops early once the estimate is clearly clear of all of them;
+    `num_simulations` is then only the upper bound.
+    """
+    if not board and len(hole) == 2:
+        # Preflop only the class matters: all 4-12 combos share one entry
+        hole = _PREFLOP_REP[preflop_class(hole)]
+    # Card masks are order-independent, so they double as the memo key
+    return _equity_cached(card_mask(hole), card_mask(board), num_opponents,
+                          opponent_range_tier, num_simulations, tuple(decision_points))
+
+def clear_equity_cache() -> None:
+    """Forget memoised equities (e.g. when a new hand starts)."""
+    _equity_cached.cache_clear()
+    with _SPOT_TALLY_LOCK:
+        _SPOT_TALLY.clear()
+
+@lru_cache(maxsize=4096)
+def _equity_cached(hole_mask: int, board_mask: int, num_opponents: int,
+                   opponent_range_tier: str, num_simulations: int,
+                   decision_points: Tuple[float, ...]) -> float:
+    return _simulate_equity(cards_from_mask(hole_mask), cards_from_mask(board_mask), num_opponents,
+                            opponent_range_tier, num_simulations, decision_points)
+
+def _simulate_equity(
+    hole: List[Card], 
+    board: List[Card], 
+    num_opponents: int,
+    opponent_range_tier: str,
+    num_simulations: int,
+    decision_points: Tuple[float, ...] = ()
+) -> float:
+    
+    known_cards = set(hole + board)
+    deck = [c for c in FULL_DECK if c not in known_cards]
+    
+    if num_opponents <= 0:
+        return 0.5  # Nobody to simulate against
+    if len(deck) < 2 * num_opponents + (5 - len(board)):
+        return 0.5  # Not enough cards
+    
+    # Range combos are fixed per tier; only the dead-card filter is per spot
+    opponent_range_cards = [h for h in _range_combos(opponent_range_tier)
+                            if h[0] not in known_cards and h[1] not in known_cards]
+
+    if not opponent_range_cards: return 0.5 # fallback
+
+    sim_args = (hole, board, deck, opponent_range_cards, num_opponents, num_simulations)
+    tally = None
+    if decision_points:
+        spot = (card_mask(hole), card_mask(board), num_opponents, opponent_range_tier)
+        with _SPOT_TALLY_LOCK:
+            start = _SPOT_TALLY.pop(spot, (0, 0, 0))
+        tally = _simulate_until_decided(*sim_args, decision_points, start)
+        with _SPOT_TALLY_LOCK:
+            if len(_SPOT_TALLY) >= _SPOT_TALLY_SIZE:
+                del _SPOT_TALLY[next(iter(_SPOT_TALLY))]
+            _SPOT_TALLY[spot] = tally
+    elif _MC_WORKERS > 1 and num_simulations >= _PARALLEL_MIN_SIMS:
+        try:
+            tally = _simulate_parallel(*sim_args)
+        except (BrokenProcessPool, OSError):
+            tally = None  # no usable worker processes – run serially instead
+    if tally is None:
+        tally = _simulate(*sim_args, random)
+    wins, ties, valid_sims = tally
+
     if valid_sims == 0: return 0.0
     return (wins + ties / 2) / valid_sims
 
+# Connected = three distinct ranks inside some five-rank window (no wrap),
+# precomputed for every 13-bit rank mask so the check is one index.
+_CONNECTED_MASK = bytes(
+    any((m >> lo & 0x1F).bit_count() >= 3 for lo in range(9)) for m in range(1 << 13)
+)
+
 def get_board_texture(board: List[Card]) -> str:
+    # Every refresh re-asks about the same board; sorted card indices make an
+    # order-independent key (kept as a tuple so duplicate cards still count)
+    return _board_texture_cached(tuple(sorted(CARD_INDEX[c] for c in board)))
+
+@lru_cache(maxsize=8192)
+def _board_texture_cached(board_key: Tuple[int, ...]) -> str:
+    board = [INDEX_CARD[i] for i in board_key]
     if not board: return "Pre-flop"
-    ranks = [c.rank_val for c in board]
-    suits = [c.suit for c in board]
-    rank_counts = Counter(ranks)
-    suit_counts = Counter(suits)
+    # One rank mask per multiplicity (seen once / twice / ...) and one rank
+    # mask per suit; every test below is then a popcount or a mask check.
+    seen = [0, 0, 0, 0]
+    suit_masks: Dict[Suit, int] = {}
+    for c in board:
+        bit = 1 << _RANK_INDEX[c.rank]
+        seen[3] |= seen[2] & bit
+        seen[2] |= seen[1] & bit
+        seen[1] |= seen[0] & bit
+        seen[0] |= bit
+        suit_masks[c.suit] = suit_masks.get(c.suit, 0) | bit
+    rank_mask = seen[0]
 
     textures = []
-    if max(rank_counts.values()) == 3: textures.append("Trips")
-    elif max(rank_counts.values()) == 2: textures.append("Paired")
+    if seen[2] and not seen[3]: textures.append("Trips")
+    elif seen[1] and not seen[2]: textures.append("Paired")
     
-    if max(suit_counts.values()) >= 3: textures.append("Monotone" if len(board) == 3 and max(suit_counts.values()) == 3 else "Flush-draw")
+    max_suited = max(map(int.bit_count, suit_masks.values()))
+    if max_suited >= 3: textures.append("Monotone" if len(board) == 3 and max_suited == 3 else "Flush-draw")
     
-    unique_ranks = sorted(list(set(ranks)))
-    is_connected = False
-    if len(unique_ranks) >= 3:
-      for i in range(len(unique_ranks) - 2):
-          if unique_ranks[i+2] - unique_ranks[i] <= 4:
-              is_connected = True
-              break
-    if is_connected: textures.append("Connected")
+    if _CONNECTED_MASK[rank_mask]: textures.append("Connected")
         
     if not textures: return "Dry/Raggedy"
     return ", ".join(textures)
@@ -360,7 +721,12 @@ def analyse_hand(hole: List[Card], board: List[Card], position: Position,
     effective_stack = stack_bb * (pot / 100.0) if pot > 0 else stack_bb  # Approximate BB value
     spr = effective_stack / pot if pot > 0 else 100
 
-    equity = calculate_equity_monte_carlo(hole, board, max(0, num_players - 1))
+    # The decision below only changes where equity crosses these edges over
+    # the pot odds, so the simulation can stop once it is clearly past them.
+    equity = calculate_equity_monte_carlo(
+        hole, board, max(0, num_players - 1),
+        decision_points=(pot_odds, pot_odds + 0.05, pot_odds + 0.10)
+    )
     board_texture = get_board_texture(board)
 
     # Adjust decision making based on equity edge and SPR
@@ -390,23 +756,27 @@ def to_two_card_str(cards: List[Card]) -> str:
     return f"{cards[0].rank}{cards[0].suit.value}{cards[1].rank}{cards[1].suit.value}" if len(cards) == 2 else "??"
 
 
+# Advice text is static – built once at import rather than on every refresh
+_POSITION_ADVICE = {
+    Position.BTN: "You have position advantage. Be aggressive with a wide range.",
+    Position.CO : "Good position. Open strong + speculative hands.",
+    Position.SB : "Poor position. Play tight, be careful post-flop.",
+    Position.BB : "Out of position. Defend selectively.",
+    Position.UTG: "Early position. Play only premium hands."
+}
+
+_HAND_ADVICE = {
+    "PREMIUM": "Value bet strongly. Be cautious on very scary boards.",
+    "STRONG": "Raise for value. Pot control if heavy resistance on wet boards.",
+    "MEDIUM": "Decent hand. Pot-control, proceed with caution on wet boards.",
+    "PLAYABLE": "Good for semi-bluffs or calling on the flop if you hit a draw.",
+}
+
 def get_position_advice(pos: Position) -> str:
-    advice = {
-        Position.BTN: "You have position advantage. Be aggressive with a wide range.",
-        Position.CO : "Good position. Open strong + speculative hands.",
-        Position.SB : "Poor position. Play tight, be careful post-flop.",
-        Position.BB : "Out of position. Defend selectively.",
-        Position.UTG: "Early position. Play only premium hands."
-    }
-    return advice.get(pos, "Play according to your position.")
+    return _POSITION_ADVICE.get(pos, "Play according to your position.")
 
 def get_hand_advice(tier: str, board_texture: str, spr: float) -> str:
-    base_advice = {
-        "PREMIUM": "Value bet strongly. Be cautious on very scary boards.",
-        "STRONG": "Raise for value. Pot control if heavy resistance on wet boards.",
-        "MEDIUM": "Decent hand. Pot-control, proceed with caution on wet boards.",
-        "PLAYABLE": "Good for semi-bluffs or calling on the flop if you hit a draw.",
-    }.get(tier, "Weak hand. Look for good bluffing spots or fold to aggression.")
+    base_advice = _HAND_ADVICE.get(tier, "Weak hand. Look for good bluffing spots or fold to aggression.")
 
     if spr < 4:
         base_advice += " With a low SPR, you should be willing to get all-in."
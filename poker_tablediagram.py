@@ -22,14 +22,21 @@ C_SB = "#FFA500"
 C_BB = "#DC143C"
 C_POT = "#1a5f3f"
 
+
+def _fmt_money(cents: int) -> str:
+    """Format integer cents as dollars without going through float formatting."""
+    dollars, cents = divmod(cents, 100)
+    return f"${dollars}.{cents:02d}"
+
+
 @dataclass
 class TableState:
     """Current state of the table."""
     active_players: Set[int]
     hero_seat: int
     dealer_seat: int
-    pot: float
-    to_call: float
+    pot_cents: int
+    to_call_cents: int
     stage: str
     equity: Optional[float] = None
 
@@ -55,8 +62,8 @@ class TableDiagramWindow(tk.Toplevel):
             active_players={1, 2, 3, 4, 5, 6},
             hero_seat=1,
             dealer_seat=3,
-            pot=0.0,
-            to_call=0.0,
+            pot_cents=0,
+            to_call_cents=0,
             stage="Pre-flop"
         )
         
@@ -94,8 +101,7 @@ class TableDiagramWindow(tk.Toplevel):
         w = self.canvas.winfo_width()
         h = self.canvas.winfo_height()
         
-        if w <= 1 or h <= 1:  # Canvas not ready yet
-            self.after(100, self._draw_table)
+        if w <= 1 or h <= 1:  # Canvas not ready yet – <Configure> will redraw it
             return
             
         # Draw table oval
@@ -302,15 +308,15 @@ class TableDiagramWindow(tk.Toplevel):
         # Pot amount
         self.canvas.create_text(
             center_x, center_y - 10,
-            text=f"POT: ${self.state.pot:.2f}",
+            text=f"POT: {_fmt_money(self.state.pot_cents)}",
             font=("Arial", 14, "bold"), fill=C_TEXT
         )
         
         # To call amount
-        if self.state.to_call > 0:
+        if self.state.to_call_cents > 0:
             self.canvas.create_text(
                 center_x, center_y + 10,
-                text=f"To Call: ${self.state.to_call:.2f}",
+                text=f"To Call: {_fmt_money(self.state.to_call_cents)}",
                 font=("Arial", 10), fill=C_TEXT_DIM
             )
             
@@ -323,14 +329,14 @@ class TableDiagramWindow(tk.Toplevel):
             )
             
     def update_state(self, active_players: Set[int], hero_seat: int,
-                     dealer_seat: int, pot: float, to_call: float,
+                     dealer_seat: int, pot_cents: int, to_call_cents: int,
                      stage: str, equity: Optional[float] = None):
         """Update the table state and redraw."""
         self.state.active_players = active_players
         self.state.hero_seat = hero_seat
         self.state.dealer_seat = dealer_seat
-        self.state.pot = pot
-        self.state.to_call = to_call
+        self.state.pot_cents = pot_cents
+        self.state.to_call_cents = to_call_cents
         self.state.stage = stage
         self.state.equity = equity
         
@@ -347,8 +353,8 @@ if __name__ == "__main__":
         active_players={1, 2, 3, 4, 5, 6},
         hero_seat=1,
         dealer_seat=3,
-        pot=150.0,
-        to_call=50.0,
+        pot_cents=15000,
+        to_call_cents=5000,
         stage="Flop",
         equity=65.5
     )
@@ -9,6 +9,7 @@ Run with: python -m pytest poker_test.py -v
 import pytest
 import sqlite3
 import tempfile
+import threading
 import os
 from typing import List, Set, Tuple
 from unittest.mock import patch, MagicMock
@@ -17,9 +18,11 @@ from collections import Counter
 # Import modules to test
 from poker_modules import (
     Suit, Rank, Card, Position, StackType, PlayerAction, GameState, HandAnalysis,
-    HandRank, RANKS_MAP, RANK_ORDER, FULL_DECK, HAND_TIERS,
-    get_hand_rank, check_straight, get_hand_tier, get_opponent_range,
-    calculate_equity_monte_carlo, get_board_texture, analyse_hand,
+    HandRank, RANKS_MAP, RANK_ORDER, FULL_DECK, HAND_TIERS, CARD_INDEX, INDEX_CARD,
+    CARD_BY_RANK_SUIT, CARD_BY_CODE,
+    card_mask, cards_from_mask,
+    get_hand_rank, check_straight, get_hand_tier, preflop_class, get_opponent_range, hand_strength,
+    calculate_equity_monte_carlo, clear_equity_cache, get_board_texture, analyse_hand,
     to_two_card_str, get_position_advice, get_hand_advice
 )
 
@@ -191,6 +194,35 @@ class TestCard:
         """Test FULL_DECK has no duplicates."""
         card_strings = [str(card) for card in FULL_DECK]
         assert len(card_strings) == len(set(card_strings))
+    
+    def test_card_index_round_trip(self):
+        """Test every card maps to a unique int 0-51 and back."""
+        assert sorted(CARD_INDEX.values()) == list(range(52))
+        for card in FULL_DECK:
+            assert INDEX_CARD[CARD_INDEX[card]] == card
+    
+    def test_card_pool_shares_instances(self):
+        """Test the card pool hands back one shared object per card."""
+        assert len(CARD_BY_RANK_SUIT) == 52
+        card = CARD_BY_RANK_SUIT['Q', Suit.DIAMOND]
+        assert card == Card('Q', Suit.DIAMOND)
+        assert card is INDEX_CARD[CARD_INDEX[card]]
+    
+    def test_card_by_code(self):
+        """Test cards parse from both the display and the typed form."""
+        assert len(CARD_BY_CODE) == 104
+        assert CARD_BY_CODE['T♥'] is CARD_BY_CODE['TH']
+        assert CARD_BY_CODE['2C'] == Card('2', Suit.CLUB)
+        assert 'XS' not in CARD_BY_CODE
+    
+    def test_card_mask_round_trip(self):
+        """Test card masks ignore order and convert back to the same cards."""
+        cards = [Card('K', Suit.HEART), Card('2', Suit.SPADE), Card('A', Suit.CLUB)]
+        mask = card_mask(cards)
+        assert mask.bit_count() == 3
+        assert mask == card_mask(cards[::-1])
+        assert set(cards_from_mask(mask)) == set(cards)
+        assert card_mask([]) == 0
 
 
 class TestPosition:
@@ -477,6 +509,45 @@ class TestHandRankComparisons:
         assert HandRank.FLUSH.value > HandRank.STRAIGHT.value
 
 
+class TestHandStrength:
+    """Test the integer hand-strength evaluator used by the equity simulations."""
+    
+    def test_category_matches_get_hand_rank(self):
+        """Test the packed category agrees with get_hand_rank on random hands."""
+        import random
+        rng = random.Random(7)
+        for _ in range(500):
+            cards = rng.sample(FULL_DECK, 7)
+            rank, _ = get_hand_rank(cards[:2], cards[2:])
+            assert hand_strength(cards[:2], cards[2:]) >> 20 == rank.value
+    
+    def test_higher_category_wins(self):
+        """Test a flush outscores a straight."""
+        board = [Card('9', Suit.HEART), Card('T', Suit.HEART), Card('J', Suit.CLUB),
+                 Card('2', Suit.HEART), Card('3', Suit.SPADE)]
+        flush = [Card('A', Suit.HEART), Card('5', Suit.HEART)]
+        straight = [Card('Q', Suit.SPADE), Card('K', Suit.CLUB)]
+        assert hand_strength(flush, board) > hand_strength(straight, board)
+    
+    def test_wheel_is_lowest_straight(self):
+        """Test A-5 straight loses to 6-high straight."""
+        board = [Card('2', Suit.SPADE), Card('3', Suit.HEART), Card('4', Suit.DIAMOND),
+                 Card('5', Suit.CLUB), Card('K', Suit.SPADE)]
+        wheel = [Card('A', Suit.HEART), Card('9', Suit.CLUB)]
+        six_high = [Card('6', Suit.HEART), Card('9', Suit.DIAMOND)]
+        assert hand_strength(wheel, board) < hand_strength(six_high, board)
+    
+    def test_kicker_decides(self):
+        """Test same pair is decided by kicker, equal kickers tie."""
+        board = [Card('A', Suit.SPADE), Card('A', Suit.HEART), Card('8', Suit.DIAMOND),
+                 Card('6', Suit.CLUB), Card('2', Suit.SPADE)]
+        king = [Card('K', Suit.HEART), Card('3', Suit.CLUB)]
+        queen = [Card('Q', Suit.HEART), Card('3', Suit.DIAMOND)]
+        other_king = [Card('K', Suit.CLUB), Card('4', Suit.DIAMOND)]
+        assert hand_strength(king, board) > hand_strength(queen, board)
+        assert hand_strength(king, board) == hand_strength(other_king, board)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # HAND TIER CLASSIFICATION TESTS (30 tests)
 # ══════════════════════════════════════════════════════════════════════════════
@@ -721,6 +792,66 @@ class TestEquityCalculation:
         equity_few = calculate_equity_monte_carlo(hole, [], 1, "MEDIUM", 500)
         assert equity_many < equity_few
     
+    def test_equity_memoised_per_card_set(self):
+        """Test repeated spots reuse the cached estimate regardless of card order."""
+        hole = [Card('Q', Suit.SPADE), Card('J', Suit.SPADE)]
+        board = [Card('2', Suit.HEART), Card('7', Suit.CLUB), Card('K', Suit.DIAMOND)]
+        first = calculate_equity_monte_carlo(hole, board, 2, "MEDIUM", 300)
+        again = calculate_equity_monte_carlo(hole[::-1], board[::-1], 2, "MEDIUM", 300)
+        assert first == again
+        
+        clear_equity_cache()
+        fresh = calculate_equity_monte_carlo(hole, board, 2, "MEDIUM", 300)
+        assert 0 <= fresh <= 1
+    
+    def test_preflop_equity_shared_across_suits(self):
+        """Test combos of one starting hand share a single preflop estimate."""
+        clear_equity_cache()
+        spades = calculate_equity_monte_carlo([Card('A', Suit.SPADE), Card('K', Suit.SPADE)], [], 2, "MEDIUM", 300)
+        hearts = calculate_equity_monte_carlo([Card('K', Suit.HEART), Card('A', Suit.HEART)], [], 2, "MEDIUM", 300)
+        assert spades == hearts
+        offsuit = [Card('A', Suit.CLUB), Card('K', Suit.DIAMOND)]
+        assert preflop_class(offsuit) == (12, 11, False)
+        assert 0 <= calculate_equity_monte_carlo(offsuit, [], 2, "MEDIUM", 300) <= 1
+    
+    def test_equity_early_stop_with_decision_points(self):
+        """Test a clear-cut spot still reports a sensible equity when stopping early."""
+        hole = [Card('A', Suit.SPADE), Card('A', Suit.HEART)]
+        board = [Card('A', Suit.DIAMOND), Card('A', Suit.CLUB), Card('2', Suit.HEART),
+                 Card('7', Suit.CLUB), Card('9', Suit.SPADE)]
+        equity = calculate_equity_monte_carlo(hole, board, 1, "MEDIUM", 2000,
+                                              decision_points=(0.3, 0.4))
+        assert equity > 0.95
+    
+    def test_early_stop_resumes_for_new_decision_points(self):
+        """Test changing only the decision points reuses the run-outs already simulated."""
+        import poker_modules
+        clear_equity_cache()
+        hole = [Card('A', Suit.SPADE), Card('A', Suit.HEART)]
+        board = [Card('A', Suit.DIAMOND), Card('A', Suit.CLUB), Card('2', Suit.HEART)]
+        first = calculate_equity_monte_carlo(hole, board, 1, "MEDIUM", 2000, decision_points=(0.3,))
+        with patch("poker_modules._simulate", wraps=poker_modules._simulate) as sim:
+            again = calculate_equity_monte_carlo(hole, board, 1, "MEDIUM", 2000, decision_points=(0.4,))
+        assert sim.call_count == 0
+        assert again == first
+    
+    def test_early_stop_stays_serial(self):
+        """Test a clear-cut spot stops after one serial chunk and never reaches the pool."""
+        import poker_modules
+        clear_equity_cache()
+        hole = [Card('A', Suit.SPADE), Card('A', Suit.HEART)]
+        board = [Card('A', Suit.DIAMOND), Card('A', Suit.CLUB), Card('2', Suit.HEART)]
+        with patch("poker_modules._MC_WORKERS", 8), \
+             patch("poker_modules._simulate_parallel") as pool, \
+             patch("poker_modules._simulate", wraps=poker_modules._simulate) as serial:
+            equity = calculate_equity_monte_carlo(hole, board, 1, "MEDIUM", 2000,
+                                                  decision_points=(0.3,))
+        assert pool.call_count == 0
+        assert serial.call_count == 1
+        assert serial.call_args.args[5] == poker_modules._SEQ_CHUNK
+        assert equity > 0.95
+        clear_equity_cache()
+    
     def test_insufficient_deck_size(self):
         """Test handling when deck is too small."""
         hole = [Card('A', Suit.SPADE), Card('K', Suit.HEART)]
@@ -1402,6 +1533,128 @@ class TestPropertyBasedInvariants:
         assert analysis1.decision == analysis2.decision
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# DECISION PERSISTENCE TESTS
+# ══════════════════════════════════════════════════════════════════════════════
+
+@pytest.fixture
+def decision_db(tmp_path, monkeypatch):
+    """poker_init pointed at a fresh database file in tmp_path."""
+    monkeypatch.chdir(tmp_path)  # the import-time bootstrap writes to cwd
+    import poker_init
+    monkeypatch.setattr(poker_init, "DB_FILE", str(tmp_path / "decisions.db"))
+    poker_init.initialise_db_if_needed()
+    yield poker_init
+    poker_init.close_db()
+    poker_init._ROWIDS.clear()
+    poker_init._counts_for_day.cache_clear()
+
+
+def _record(db_module, decision="CALL"):
+    analysis = HandAnalysis(decision=decision, reason="", equity=0.5, required_eq=0.3,
+                            ev_call=0.0, ev_raise=0.0, board_texture="Dry/Raggedy", spr=4.0)
+    return db_module.record_decision(analysis, Position.BTN, "MEDIUM", 100, 1.5, 1.0, "")
+
+
+def _stored(db_module):
+    with sqlite3.connect(db_module.DB_FILE) as conn:
+        return conn.execute("SELECT id, decision FROM decisions ORDER BY id").fetchall()
+
+
+class TestDecisionPersistence:
+    """Test the write-behind decision store in poker_init."""
+
+    def test_record_queues_until_flush(self, decision_db):
+        """Recorded decisions stay in memory until flushed, but are counted."""
+        _record(decision_db)
+        _record(decision_db, "FOLD")
+        assert decision_db.pending_decision_count() == 2
+        assert _stored(decision_db) == []
+        assert decision_db.decision_counts_today() == {"CALL": 1, "FOLD": 1}
+
+        assert decision_db.flush_decisions() == 2
+        assert decision_db.pending_decision_count() == 0
+        assert [d for _, d in _stored(decision_db)] == ["CALL", "FOLD"]
+        assert decision_db.decision_counts_today() == {"CALL": 1, "FOLD": 1}
+
+    def test_update_before_and_after_flush(self, decision_db):
+        """update_decision reaches both queued and already-written rows."""
+        queued = _record(decision_db)
+        decision_db.update_decision(queued, "RAISE")
+        decision_db.flush_decisions()
+        written = _record(decision_db)
+        decision_db.flush_decisions()
+        decision_db.update_decision(written, "FOLD")
+
+        assert [d for _, d in _stored(decision_db)] == ["RAISE", "FOLD"]
+        assert decision_db.decision_counts_today() == {"RAISE": 1, "FOLD": 1}
+
+    def test_flush_survives_another_writer(self, decision_db):
+        """Rows written by another connection never collide with a queued batch."""
+        decision_db.flush_decisions()  # opens the shared connection
+        mine = _record(decision_db)
+        with sqlite3.connect(decision_db.DB_FILE) as other:
+            other.execute("INSERT INTO decisions (decision) VALUES ('CHECK')")
+
+        assert decision_db.flush_decisions() == 1
+        decision_db.update_decision(mine, "RAISE")
+        assert [d for _, d in _stored(decision_db)] == ["CHECK", "RAISE"]
+
+    def test_recording_and_counting_do_not_wait_for_writer(self, decision_db):
+        """Tk-thread calls never block on a writer holding the DB lock."""
+        held, release = threading.Event(), threading.Event()
+
+        def writer():
+            with decision_db._DB_LOCK:
+                held.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=writer)
+        holder.start()
+        held.wait(5)
+        results = []
+        caller = threading.Thread(target=lambda: results.append(
+            (_record(decision_db), decision_db.decision_counts_today())))
+        try:
+            caller.start()
+            caller.join(2)
+            assert not caller.is_alive()
+        finally:
+            release.set()
+            holder.join()
+            caller.join()
+        assert results[0][1] == {"CALL": 1}
+
+    def test_counts_stay_fresh_when_flush_lands_mid_read(self, decision_db):
+        """A flush committing between the stats query and its caching is not lost."""
+        _record(decision_db)
+        real_open = decision_db._open_reader
+
+        class FlushAfterQuery:
+            def __init__(self, conn):
+                self._conn = conn
+
+            def execute(self, *args):
+                rows = self._conn.execute(*args).fetchall()
+                decision_db.flush_decisions()  # lands before the result is cached
+                return MagicMock(fetchall=lambda: rows)
+
+        with patch.object(decision_db, "_open_reader", lambda: FlushAfterQuery(real_open())):
+            assert decision_db.decision_counts_today() == {"CALL": 1}
+        assert decision_db.pending_decision_count() == 0
+        assert decision_db.decision_counts_today() == {"CALL": 1}
+
+    def test_close_flushes_and_closes(self, decision_db):
+        """close_db writes what is queued and releases both connections."""
+        _record(decision_db)
+        decision_db.decision_counts_today()  # opens the reader connection
+        decision_db.close_db()
+
+        assert decision_db._DB_CON is None and decision_db._READ_CON is None
+        assert [d for _, d in _stored(decision_db)] == ["CALL"]
+
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # RUN ALL TESTS
 # ══════════════════════════════════════════════════════════════════════════════
@@ -1414,14 +1667,15 @@ if __name__ == "__main__":
     test_classes = [
         TestSuit, TestRank, TestCard, TestPosition, TestStackType, 
         TestPlayerAction, TestGameState, TestHandAnalysis,
-        TestCheckStraight, TestGetHandRank, TestHandRankComparisons,
+        TestCheckStraight, TestGetHandRank, TestHandRankComparisons, TestHandStrength,
         TestGetHandTier, TestHandTierData,
         TestGetOpponentRange, TestEquityCalculation, TestBoardTexture,
         TestAnalyseHand, TestDecisionConsistency,
         TestUtilityFunctions, TestErrorHandling,
         TestCompleteHandScenarios, TestConsistencyAcrossScenarios,
         TestPerformance, TestStressScenarios,
-        TestRandomizedScenarios, TestPropertyBasedInvariants
+        TestRandomizedScenarios, TestPropertyBasedInvariants,
+        TestDecisionPersistence
     ]
     
     for test_class in test_classes: